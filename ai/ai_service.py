@@ -1,9 +1,13 @@
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 from pydantic import BaseModel
 from datetime import datetime
+from contextlib import asynccontextmanager
+from typing import Optional
 import os
+import asyncio
 import tempfile
 import uuid
 import logging
@@ -11,13 +15,57 @@ import httpx
 from dotenv import load_dotenv
 from gtts import gTTS
 
+from fortune_cache import fortune_cache
+from tts_store import TTSStore
+from emotion_classifier import (
+    EmotionPrediction, get_emotion_engine, normalize_label, EMOTION_CONFIDENCE_THRESHOLD
+)
+from emotion_jobs import (
+    EmotionBatchRequest, EmotionJobRunner, EmotionJobStore, stream_job, EMOTION_BATCH_MAX_ITEMS
+)
+
 # 환경 변수 로드
 load_dotenv()
 
+# OpenAI 업스트림 HTTP 클라이언트 설정 (연결 재사용)
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+HTTP_MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2_ENABLED = os.getenv("HTTP2_ENABLED", "true").lower() == "true"
+
+# 앱 수명 동안 공유하는 비동기 HTTP 클라이언트
+http_client: Optional[httpx.AsyncClient] = None
+
+def get_http_client() -> httpx.AsyncClient:
+    """공유 HTTP 클라이언트 반환"""
+    if http_client is None:
+        raise RuntimeError("HTTP 클라이언트가 초기화되지 않았습니다")
+    return http_client
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """앱 시작 시 공유 HTTP 클라이언트를 만들고 종료 시 닫습니다"""
+    global http_client
+    http_client = httpx.AsyncClient(
+        http2=HTTP2_ENABLED,
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE,
+            keepalive_expiry=HTTP_KEEPALIVE_EXPIRY
+        ),
+        timeout=httpx.Timeout(30.0, connect=5.0)
+    )
+    try:
+        yield
+    finally:
+        await http_client.aclose()
+        http_client = None
+
 app = FastAPI(
     title="Unified AI Service",
     description="STT, TTS, 운세 서비스를 통합한 AI 서비스",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -42,9 +90,12 @@ logger = logging.getLogger(__name__)
 ALLOWED_EXTENSIONS = {'mp3', 'wav', 'm4a', 'ogg', 'flac', 'aac'}
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
 
-# TTS 출력 디렉토리
+# TTS 출력 디렉토리 (내용 주소 기반 저장소)
 TTS_OUTPUT_DIR = "tts_outputs"
-os.makedirs(TTS_OUTPUT_DIR, exist_ok=True)
+TTS_LANG = "ko"
+TTS_SLOW = False
+TTS_STREAM_CACHE = os.getenv("TTS_STREAM_CACHE", "true").lower() == "true"  # 스트리밍 결과도 캐시에 저장
+tts_store = TTSStore(TTS_OUTPUT_DIR)
 
 # Pydantic 모델
 class FortuneResponse(BaseModel):
@@ -62,13 +113,15 @@ class EmotionExtractionRequest(BaseModel):
 
 class EmotionExtractionResponse(BaseModel):
     emotion: str
+    confidence: Optional[float] = None
+    source: Optional[str] = None  # keyword | transformers | gpt
 
 def allowed_file(filename):
     """파일 확장자 검증"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def transcribe_audio(audio_file_path, language='ko'):
+async def transcribe_audio(audio_file_path, language='ko'):
     """OpenAI Whisper API를 사용하여 오디오를 텍스트로 변환"""
     if not api_key:
         return {
@@ -103,22 +156,23 @@ def transcribe_audio(audio_file_path, language='ko'):
         }
         
         with open(audio_file_path, 'rb') as audio_file:
-            files = {
-                'file': audio_file,
-                'model': (None, 'whisper-1'),
-                'language': (None, language),
-                'response_format': (None, 'verbose_json')
-            }
-            
-            with httpx.Client() as client:
-                response = client.post(
-                    "https://api.openai.com/v1/audio/transcriptions",
-                    headers=headers,
-                    files=files,
-                    timeout=60.0
-                )
-                response.raise_for_status()
-                result = response.json()
+            audio_bytes = audio_file.read()
+        
+        files = {
+            'file': (os.path.basename(audio_file_path), audio_bytes),
+            'model': (None, 'whisper-1'),
+            'language': (None, language),
+            'response_format': (None, 'verbose_json')
+        }
+        
+        response = await get_http_client().post(
+            "https://api.openai.com/v1/audio/transcriptions",
+            headers=headers,
+            files=files,
+            timeout=60.0
+        )
+        response.raise_for_status()
+        result = response.json()
                 
         return {
             'success': True,
@@ -138,13 +192,20 @@ def transcribe_audio(audio_file_path, language='ko'):
             'error': str(e)
         }
 
-def generate_fortune(birthday: str) -> str:
-    """OpenAI GPT를 사용하여 개인화된 운세를 생성합니다."""
+async def generate_fortune(birthday: str) -> str:
+    """오늘의 운세를 반환합니다. (생년월일, 날짜)별로 자정까지 캐시됩니다."""
     if not api_key:
         raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
     
+    today = datetime.now().date()
+    return await fortune_cache.get_or_create(
+        birthday, today, lambda: _request_fortune(birthday, today)
+    )
+
+async def _request_fortune(birthday: str, today) -> str:
+    """OpenAI GPT를 사용하여 개인화된 운세를 생성합니다."""
     try:
-        current_date = datetime.now().strftime('%Y년 %m월 %d일')
+        current_date = today.strftime('%Y년 %m월 %d일')
         birth_year = birthday[:4]
         birth_month = birthday[4:6]
         birth_day = birthday[6:]
@@ -172,15 +233,14 @@ def generate_fortune(birthday: str) -> str:
             "max_tokens": 150
         }
         
-        with httpx.Client() as client:
-            response = client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await get_http_client().post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            json=data,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        result = response.json()
 
         # 응답 파싱
         fortune_text = result["choices"][0]["message"]["content"]
@@ -194,7 +254,7 @@ def generate_fortune(birthday: str) -> str:
         print(f"Error generating fortune: {str(e)}")
         raise HTTPException(status_code=500, detail=f"운세 생성 중 오류가 발생했습니다: {str(e)}")
 
-def analyze_diary(entry: DiaryEntry) -> str:
+async def analyze_diary(entry: DiaryEntry) -> str:
     """일기 내용을 분석하고 위로의 메시지를 생성합니다."""
     if not api_key:
         raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
@@ -230,15 +290,14 @@ def analyze_diary(entry: DiaryEntry) -> str:
             "temperature": 0.7
         }
         
-        with httpx.Client() as client:
-            response = client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await get_http_client().post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            json=data,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        result = response.json()
 
         if not result.get("choices") or not result["choices"][0].get("message", {}).get("content"):
             raise ValueError("OpenAI API에서 유효한 응답을 받지 못했습니다")
@@ -260,11 +319,33 @@ def analyze_diary(entry: DiaryEntry) -> str:
         logger.error(f"일기 분석 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=f"일기 처리 중 오류 발생: {str(e)}")
 
-def extract_emotion(text: str) -> str:
-    """일기 내용에서 감정을 추출"""
-    if not api_key:
-        return "neutral"
+async def classify_emotion(text: str) -> EmotionPrediction:
+    """일기 내용에서 감정을 분류 (로컬 엔진 우선, 신뢰도가 낮을 때만 GPT 사용)"""
+    engine = get_emotion_engine()
+    try:
+        if engine.blocking:
+            prediction = await asyncio.to_thread(engine.predict, text)
+        else:
+            prediction = engine.predict(text)
+    except Exception as e:
+        logger.error(f"로컬 감정 분류 실패: {str(e)}")
+        prediction = EmotionPrediction("neutral", 0.0, engine.name)
+    
+    if prediction.confidence >= EMOTION_CONFIDENCE_THRESHOLD or not api_key:
+        logger.info(f"감정 분류 완료(로컬): {prediction.emotion} ({prediction.confidence})")
+        return prediction
     
+    emotion = await _request_emotion_gpt(text)
+    if emotion is None:
+        return prediction
+    return EmotionPrediction(emotion, 1.0, "gpt")
+
+async def extract_emotion(text: str) -> str:
+    """일기 내용에서 감정을 추출"""
+    return (await classify_emotion(text)).emotion
+
+async def _request_emotion_gpt(text: str) -> Optional[str]:
+    """GPT로 감정 추출 (실패 시 None)"""
     try:
         # 일기 내용을 기반으로 감정 추출
         prompt = f"""
@@ -311,26 +392,26 @@ def extract_emotion(text: str) -> str:
             "temperature": 0.3
         }
         
-        with httpx.Client() as client:
-            response = client.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers=headers,
-                json=data,
-                timeout=30.0
-            )
-            response.raise_for_status()
-            result = response.json()
+        response = await get_http_client().post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            json=data,
+            timeout=30.0
+        )
+        response.raise_for_status()
+        result = response.json()
 
         if not result.get("choices") or not result["choices"][0].get("message", {}).get("content"):
-            return "neutral"
+            return None
 
-        emotion = result["choices"][0]["message"]["content"].strip().lower()
-        logger.info(f"감정 추출 완료: {emotion}")
+        # 지원 라벨만 반환 (예: "Happy." → "happy")
+        emotion = normalize_label(result["choices"][0]["message"]["content"]) or "neutral"
+        logger.info(f"감정 추출 완료(GPT): {emotion}")
         return emotion
             
     except Exception as e:
         logger.error(f"감정 추출 중 예외 발생: {str(e)}")
-        return "neutral"
+        return None
 
 # STT 엔드포인트
 @app.post("/stt/transcribe")
@@ -378,7 +459,7 @@ async def transcribe_audio_endpoint(
             logger.info(f"임시 파일 저장: {temp_path}")
             
             # STT 변환
-            result = transcribe_audio(temp_path, language)
+            result = await transcribe_audio(temp_path, language)
             
             if result['success']:
                 return {
@@ -413,25 +494,66 @@ async def text_to_speech(
     """텍스트를 음성으로 변환하는 엔드포인트"""
     try:
         logger.info(f"TTS 요청 받음: {text} (볼륨: {volume}%)")
-        tts = gTTS(text, lang='ko', slow=False)
-        filename = f"{uuid.uuid4()}.mp3"
-        filepath = os.path.join(TTS_OUTPUT_DIR, filename)
-        logger.info(f"파일 저장 경로: {filepath}")
-        tts.save(filepath)
+        # 볼륨은 클라이언트 재생 시 적용되므로 캐시 키에 포함하지 않음
+        key = tts_store.make_key(text, TTS_LANG, TTS_SLOW)
         
-        # 파일이 실제로 생성되었는지 확인
-        if os.path.exists(filepath):
-            file_size = os.path.getsize(filepath)
-            logger.info(f"파일 생성 완료: {filename}, 크기: {file_size} bytes")
-        else:
-            logger.error(f"파일 생성 실패: {filepath}")
-            raise HTTPException(status_code=500, detail="음성 파일 생성에 실패했습니다.")
+        async def synthesize(filepath: str):
+            logger.info(f"음성 합성 시작: {filepath}")
+            tts = gTTS(text, lang=TTS_LANG, slow=TTS_SLOW)
+            await asyncio.to_thread(tts.save, filepath)
+            if not os.path.exists(filepath):
+                logger.error(f"파일 생성 실패: {filepath}")
+                raise HTTPException(status_code=500, detail="음성 파일 생성에 실패했습니다.")
+            logger.info(f"파일 생성 완료: 크기: {os.path.getsize(filepath)} bytes")
+        
+        filename, cached = await tts_store.get_or_synthesize(key, synthesize)
+        logger.info(f"TTS 파일: {filename} (캐시 적중: {cached})")
             
         return {"audio_url": f"/tts/audio/{filename}"}
     except Exception as e:
         logger.error(f"TTS 오류: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/tts/stream")
+async def text_to_speech_stream(
+    text: str = Query(..., description="음성으로 변환할 텍스트"),
+    volume: int = Query(50, description="음성 볼륨 (0-100)", ge=0, le=100)
+):
+    """텍스트를 음성으로 변환하면서 생성되는 오디오 청크를 바로 스트리밍하는 엔드포인트"""
+    logger.info(f"TTS 스트리밍 요청 받음: {text} (볼륨: {volume}%)")
+    key = tts_store.make_key(text, TTS_LANG, TTS_SLOW)
+    
+    # 이미 합성된 음성이 있으면 파일을 그대로 전송
+    filename = tts_store.lookup(key)
+    if filename:
+        logger.info(f"TTS 캐시 적중: {filename}")
+        return FileResponse(os.path.join(TTS_OUTPUT_DIR, filename), media_type="audio/mpeg")
+    
+    async def audio_chunks():
+        tts = gTTS(text, lang=TTS_LANG, slow=TTS_SLOW)
+        tmp_path = tts_store.temp_path_for(key) if TTS_STREAM_CACHE else None
+        tmp_file = open(tmp_path, "wb") if tmp_path else None
+        completed = False
+        try:
+            # gTTS는 텍스트 조각마다 MP3 청크를 만들어 내므로 만들어지는 대로 전송
+            async for chunk in iterate_in_threadpool(tts.stream()):
+                if tmp_file:
+                    tmp_file.write(chunk)
+                yield chunk
+            completed = True
+        finally:
+            if tmp_file:
+                tmp_file.close()
+                # 끝까지 합성된 경우에만 캐시에 등록 (클라이언트 중단 시 폐기)
+                if completed:
+                    tts_store.commit(key, tmp_path)
+                    await asyncio.to_thread(tts_store.evict)
+                elif os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    
+    # Content-Length 없이 청크 전송(Transfer-Encoding: chunked)
+    return StreamingResponse(audio_chunks(), media_type="audio/mpeg")
+
 @app.get("/tts/audio/{filename}")
 async def get_audio(filename: str):
     """생성된 음성 파일을 반환하는 엔드포인트"""
@@ -441,7 +563,12 @@ async def get_audio(filename: str):
     if os.path.exists(filepath):
         file_size = os.path.getsize(filepath)
         logger.info(f"파일 존재, 크기: {file_size} bytes")
-        return FileResponse(filepath, media_type="audio/mpeg")
+        # 파일명이 내용 해시이므로 내용이 바뀌지 않음 → 장기 캐시 허용
+        return FileResponse(
+            filepath,
+            media_type="audio/mpeg",
+            headers={"Cache-Control": "public, max-age=31536000, immutable"}
+        )
     logger.error(f"파일 없음: {filepath}")
     raise HTTPException(status_code=404, detail="파일을 찾을 수 없습니다.")
 
@@ -470,7 +597,7 @@ async def get_fortune(birthday: str = Query(..., description="생년월일 (YYYY
             raise HTTPException(status_code=400, detail="올바른 일을 입력해주세요 (01-31)")
         
         # 운세 생성
-        fortune_text = generate_fortune(birthday)
+        fortune_text = await generate_fortune(birthday)
         return FortuneResponse(fortune=fortune_text)
         
     except HTTPException:
@@ -485,7 +612,7 @@ async def analyze_diary_endpoint(entry: DiaryEntry):
     """일기 내용을 분석하고 위로의 메시지를 생성합니다."""
     try:
         # 일기 분석
-        comfort_message = analyze_diary(entry)
+        comfort_message = await analyze_diary(entry)
         return ComfortResponse(message=comfort_message)
         
     except HTTPException:
@@ -499,8 +626,12 @@ async def analyze_diary_endpoint(entry: DiaryEntry):
 async def extract_emotion_endpoint(request: EmotionExtractionRequest):
     """일기 내용에서 감정을 추출하는 엔드포인트"""
     try:
-        emotion = extract_emotion(request.text)
-        return EmotionExtractionResponse(emotion=emotion)
+        prediction = await classify_emotion(request.text)
+        return EmotionExtractionResponse(
+            emotion=prediction.emotion,
+            confidence=prediction.confidence,
+            source=prediction.engine
+        )
         
     except HTTPException:
         raise
@@ -508,6 +639,43 @@ async def extract_emotion_endpoint(request: EmotionExtractionRequest):
         logger.error(f"감정 추출 오류: {str(e)}")
         raise HTTPException(status_code=500, detail="감정 추출 중 오류가 발생했습니다.")
 
+# 대량 감정 추출 작업 실행기 (job_id별 진행 상황 보관)
+emotion_job_runner = EmotionJobRunner(classify_emotion, EmotionJobStore())
+
+# 대량 감정 추출 엔드포인트
+@app.post("/diary/extract-emotion/batch")
+async def extract_emotion_batch_endpoint(request: EmotionBatchRequest):
+    """여러 일기의 감정을 한 번에 추출하고 결과를 NDJSON으로 스트리밍하는 엔드포인트
+
+    완료되는 순서대로 {"id", "emotion", "confidence", "source"} 줄을 보내고,
+    마지막 줄에 {"job_id", "total", "completed", "failed", "done"} 요약을 보냅니다.
+    같은 job_id로 다시 요청하면 이미 처리된 항목은 저장된 결과를 그대로 돌려줍니다.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="감정을 추출할 항목이 없습니다.")
+    if len(request.items) > EMOTION_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {EMOTION_BATCH_MAX_ITEMS}개까지 요청할 수 있습니다."
+        )
+    if request.job_id and not EmotionJobStore.is_valid_job_id(request.job_id):
+        raise HTTPException(status_code=400, detail="올바르지 않은 job_id입니다. (영문, 숫자, -, _ 최대 64자)")
+
+    return StreamingResponse(
+        stream_job(emotion_job_runner, request),
+        media_type="application/x-ndjson"
+    )
+
+@app.get("/diary/extract-emotion/jobs/{job_id}")
+async def get_emotion_job(job_id: str):
+    """대량 감정 추출 작업의 진행 상황 조회"""
+    if not EmotionJobStore.is_valid_job_id(job_id):
+        raise HTTPException(status_code=400, detail="올바르지 않은 job_id입니다. (영문, 숫자, -, _ 최대 64자)")
+    progress = await asyncio.to_thread(emotion_job_runner.store.progress, job_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다.")
+    return progress
+
 # 헬스 체크 엔드포인트
 @app.get("/health")
 async def health_check():
@@ -519,8 +687,10 @@ async def health_check():
             "stt": "available",
             "tts": "available",
             "fortune": "available" if api_key else "unavailable (API key not set)",
-            "diary": "available" if api_key else "unavailable (API key not set)"
+            "diary": "available" if api_key else "unavailable (API key not set)",
+            "emotion": f"available (local: {get_emotion_engine().name})"
         },
+        "fortune_cache": fortune_cache.stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -533,8 +703,11 @@ async def root():
         "services": {
             "stt": "/stt/transcribe",
             "tts": "/tts",
+            "tts_stream": "/tts/stream",
             "fortune": "/fortune",
             "diary": "/diary/analyze",
+            "emotion": "/diary/extract-emotion",
+            "emotion_batch": "/diary/extract-emotion/batch",
             "health": "/health"
         }
     }
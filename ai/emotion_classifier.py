@@ -0,0 +1,132 @@
+"""
+로컬 감정 분류 엔진 모듈
+
+일기 텍스트를 12개 감정 라벨 중 하나로 분류합니다. 네트워크 없이 CPU에서 동작하며,
+신뢰도가 낮을 때만 GPT로 넘기도록 (라벨, 신뢰도)를 함께 반환합니다.
+
+- KeywordEmotionEngine: 한국어/영어 키워드 사전 기반 (기본값, 의존성 없음)
+- TransformersEmotionEngine: transformers 제로샷 분류 모델 기반 (EMOTION_ENGINE=transformers)
+"""
+import os
+import re
+import logging
+import threading
+from collections import Counter
+from typing import Dict, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 설정
+EMOTION_ENGINE = os.getenv("EMOTION_ENGINE", "keyword")  # keyword | transformers
+EMOTION_MODEL = os.getenv("EMOTION_MODEL", "MoritzLaurer/mDeBERTa-v3-base-mnli-xnli")
+EMOTION_CONFIDENCE_THRESHOLD = float(os.getenv("EMOTION_CONFIDENCE_THRESHOLD", "0.5"))
+
+# 지원하는 감정 라벨 (백엔드 이모지 매핑과 동일)
+EMOTION_LABELS: Tuple[str, ...] = (
+    "happy", "sad", "angry", "excited", "anxious", "calm",
+    "confident", "confused", "determined", "love", "touched", "neutral",
+)
+
+class EmotionPrediction(NamedTuple):
+    """감정 분류 결과"""
+    emotion: str
+    confidence: float
+    engine: str
+
+def normalize_label(raw: Optional[str]) -> Optional[str]:
+    """모델/GPT 출력에서 지원 라벨을 추출 (없으면 None)"""
+    if not raw:
+        return None
+    for token in re.findall(r"[a-z]+", raw.lower()):
+        if token in EMOTION_LABELS:
+            return token
+    return None
+
+class EmotionEngine:
+    """감정 분류 엔진 기본 클래스"""
+
+    name = "base"
+    blocking = False  # True면 이벤트 루프 밖(스레드)에서 실행해야 함
+
+    def predict(self, text: str) -> EmotionPrediction:
+        raise NotImplementedError
+
+class KeywordEmotionEngine(EmotionEngine):
+    """키워드 사전 기반 감정 분류 엔진"""
+
+    name = "keyword"
+
+    # 감정별 키워드 (한국어는 활용형을 고려해 어간 위주)
+    KEYWORDS: Dict[str, Tuple[str, ...]] = {
+        "happy": ("행복", "기쁘", "기뻐", "기뻤", "즐거", "즐겁", "좋았", "웃었", "웃음", "happy", "glad", "joy"),
+        "sad": ("슬프", "슬퍼", "슬펐", "우울", "눈물", "울었", "외로", "서운", "속상", "sad", "depressed", "lonely"),
+        "angry": ("화나", "화가 나", "화가 났", "화났", "짜증", "분노", "열받", "억울", "빡쳐", "angry", "annoyed", "furious"),
+        "excited": ("신나", "신났", "설레", "설렜", "두근", "기대돼", "기대된", "흥분", "excited", "thrilled"),
+        "anxious": ("불안", "걱정", "초조", "긴장", "무서", "두려", "떨려", "anxious", "worried", "nervous"),
+        "calm": ("평온", "차분", "편안", "여유", "느긋", "잔잔", "고요", "calm", "relaxed", "peaceful"),
+        "confident": ("자신감", "자신있", "자신 있", "확신", "뿌듯", "해냈", "잘했", "confident", "proud"),
+        "confused": ("혼란", "헷갈", "당황", "모르겠", "복잡", "어리둥절", "confused", "puzzled"),
+        "determined": ("결심", "다짐", "목표", "포기하지", "꼭 ", "해내겠", "노력하", "determined", "resolve"),
+        "love": ("사랑", "좋아해", "보고 싶", "보고싶", "애정", "설렘", "love", "adore"),
+        "touched": ("감동", "감사", "고마", "뭉클", "찡했", "울컥", "touched", "grateful", "thankful"),
+        "neutral": ("그냥", "평범", "보통", "별일 없", "무난", "그럭저럭", "ordinary", "usual"),
+    }
+
+    def predict(self, text: str) -> EmotionPrediction:
+        lowered = (text or "").lower()
+        scores: Counter = Counter()
+        for label, keywords in self.KEYWORDS.items():
+            for keyword in keywords:
+                count = lowered.count(keyword)
+                if count:
+                    scores[label] += count
+
+        if not scores:
+            return EmotionPrediction("neutral", 0.0, self.name)
+
+        ranked = scores.most_common(2)
+        label, top = ranked[0]
+        runner_up = ranked[1][1] if len(ranked) > 1 else 0
+        # 근거(키워드 수)가 많고 2위 감정과의 차이가 클수록 신뢰도가 높음
+        # 키워드 하나만 맞으면 1/3이므로 기본 기준값(0.5)을 넘으려면 같은 감정 키워드가 2개 이상 필요
+        # (부분 문자열 매칭이라 "목표", "고마" 같은 키워드 하나로는 확신할 수 없음)
+        confidence = (top - runner_up) / (sum(scores.values()) + 2)
+        return EmotionPrediction(label, round(confidence, 3), self.name)
+
+class TransformersEmotionEngine(EmotionEngine):
+    """transformers 제로샷 분류 기반 감정 분류 엔진 (다국어 NLI 모델)"""
+
+    name = "transformers"
+    blocking = True
+
+    def __init__(self, model_name: str = EMOTION_MODEL):
+        self.model_name = model_name
+        self._pipeline = None
+        self._lock = threading.Lock()
+
+    def _get_pipeline(self):
+        if self._pipeline is None:
+            with self._lock:
+                if self._pipeline is None:
+                    from transformers import pipeline
+
+                    logger.info(f"감정 분류 모델 로딩 시작: {self.model_name}")
+                    self._pipeline = pipeline("zero-shot-classification", model=self.model_name, device=-1)
+                    logger.info("감정 분류 모델 로딩 완료")
+        return self._pipeline
+
+    def predict(self, text: str) -> EmotionPrediction:
+        result = self._get_pipeline()(text, candidate_labels=list(EMOTION_LABELS))
+        return EmotionPrediction(result["labels"][0], round(float(result["scores"][0]), 3), self.name)
+
+_engine: Optional[EmotionEngine] = None
+
+def get_emotion_engine() -> EmotionEngine:
+    """설정(EMOTION_ENGINE)에 맞는 감정 분류 엔진 반환 (프로세스당 1개)"""
+    global _engine
+    if _engine is None:
+        if EMOTION_ENGINE == "transformers":
+            _engine = TransformersEmotionEngine()
+        else:
+            _engine = KeywordEmotionEngine()
+    return _engine
@@ -0,0 +1,166 @@
+"""
+대량 감정 추출 작업 실행 모듈
+
+여러 일기 텍스트를 제한된 동시성으로 분류하고, 완료되는 대로 결과를 돌려줍니다.
+작업 진행 상황은 작업 ID별 JSONL 파일에 한 줄씩 기록되므로, 중단된 작업을 같은
+job_id로 다시 요청하면 이미 처리된 항목은 건너뛰고 이어서 진행합니다.
+결과에는 분류한 텍스트의 해시를 함께 기록해서, 그 사이 내용이 바뀐 항목은 다시 분류합니다.
+"""
+import os
+import re
+import json
+import uuid
+import hashlib
+import asyncio
+import logging
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from emotion_classifier import EmotionPrediction
+
+logger = logging.getLogger(__name__)
+
+# 설정
+EMOTION_JOBS_DIR = os.getenv("EMOTION_JOBS_DIR", "emotion_jobs")
+EMOTION_BATCH_CONCURRENCY = int(os.getenv("EMOTION_BATCH_CONCURRENCY", "8"))
+EMOTION_BATCH_MAX_ITEMS = int(os.getenv("EMOTION_BATCH_MAX_ITEMS", "1000"))
+
+def text_hash(text: str) -> str:
+    """분류한 텍스트의 SHA-256 해시 (저장된 결과가 같은 내용에 대한 것인지 확인용)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class EmotionBatchItem(BaseModel):
+    id: str  # 호출자가 결과를 매칭할 식별자 (예: post_id)
+    text: str
+
+class EmotionBatchRequest(BaseModel):
+    items: List[EmotionBatchItem]
+    job_id: Optional[str] = None  # 같은 job_id로 다시 요청하면 이어서 진행
+
+class EmotionJobStore:
+    """작업별 완료 결과를 JSONL 파일로 보관하는 저장소"""
+
+    def __init__(self, directory: str = EMOTION_JOBS_DIR):
+        self.directory = directory
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, job_id: str) -> str:
+        return os.path.join(self.directory, f"{job_id}.jsonl")
+
+    @staticmethod
+    def is_valid_job_id(job_id: str) -> bool:
+        return bool(re.fullmatch(r"[A-Za-z0-9_-]{1,64}", job_id))
+
+    def load(self, job_id: str) -> Dict[str, dict]:
+        """작업에서 이미 완료된 항목 결과 반환 ({item_id: result})"""
+        done: Dict[str, dict] = {}
+        path = self._path(job_id)
+        if not os.path.exists(path):
+            return done
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    done[record["id"]] = record
+                except (ValueError, KeyError):
+                    # 기록 도중 중단된 마지막 줄은 무시
+                    continue
+        return done
+
+    def append(self, job_id: str, record: dict):
+        """완료된 항목 결과 한 줄 추가"""
+        with open(self._path(job_id), "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def progress(self, job_id: str) -> Optional[dict]:
+        """작업 진행 상황 반환 (작업이 없으면 None)"""
+        path = self._path(job_id)
+        if not os.path.exists(path):
+            return None
+        return {
+            "job_id": job_id,
+            "completed": len(self.load(job_id)),
+            "updated_at": datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+        }
+
+class EmotionJobRunner:
+    """대량 감정 추출 작업 실행기"""
+
+    def __init__(
+        self,
+        classify: Callable[[str], Awaitable[EmotionPrediction]],
+        store: EmotionJobStore,
+        concurrency: int = EMOTION_BATCH_CONCURRENCY
+    ):
+        self.classify = classify
+        self.store = store
+        self.concurrency = concurrency
+
+    async def run(self, job_id: str, items: List[EmotionBatchItem]) -> AsyncIterator[dict]:
+        """항목을 분류하며 완료되는 순서대로 결과를 반환 (같은 내용으로 이미 완료된 항목은 저장된 결과 반환)"""
+        done = await asyncio.to_thread(self.store.load, job_id)
+        pending = []
+        for item in items:
+            record = done.get(item.id)
+            if record is not None and record.get("text_hash") == text_hash(item.text):
+                yield self._public(dict(record, resumed=True))
+            else:
+                pending.append(item)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def classify_item(item: EmotionBatchItem) -> dict:
+            async with semaphore:
+                try:
+                    prediction = await self.classify(item.text)
+                    record = {
+                        "id": item.id,
+                        "emotion": prediction.emotion,
+                        "confidence": prediction.confidence,
+                        "source": prediction.engine,
+                        "text_hash": text_hash(item.text),
+                    }
+                except Exception as e:
+                    logger.error(f"대량 감정 추출 항목 실패 ({item.id}): {str(e)}")
+                    return {"id": item.id, "error": str(e)}
+            # 실패한 항목은 기록하지 않으므로 재요청 시 다시 처리됨
+            await asyncio.to_thread(self.store.append, job_id, record)
+            return self._public(record)
+
+        tasks = [asyncio.create_task(classify_item(item)) for item in pending]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            # 클라이언트 연결이 끊기면 남은 작업 취소 (완료분은 이미 기록됨)
+            for task in tasks:
+                task.cancel()
+
+    @staticmethod
+    def _public(record: dict) -> dict:
+        """저장용 필드(text_hash)를 뺀 응답용 결과"""
+        record.pop("text_hash", None)
+        return record
+
+async def stream_job(runner: EmotionJobRunner, request: EmotionBatchRequest) -> AsyncIterator[bytes]:
+    """작업 결과를 NDJSON 줄 단위로 스트리밍 (마지막 줄은 작업 요약)"""
+    job_id = request.job_id or uuid.uuid4().hex
+    completed = 0
+    failed = 0
+    async for record in runner.run(job_id, request.items):
+        if "error" in record:
+            failed += 1
+        else:
+            completed += 1
+        yield (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    summary = {
+        "job_id": job_id,
+        "total": len(request.items),
+        "completed": completed,
+        "failed": failed,
+        "done": True,
+    }
+    yield (json.dumps(summary, ensure_ascii=False) + "\n").encode("utf-8")
@@ -0,0 +1,150 @@
+"""
+오늘의 운세 캐시 모듈
+
+(생년월일, 날짜) 조합별로 생성된 운세를 자정(로컬 시간)까지 보관합니다.
+- 메모리 계층: 크기가 제한된 LRU
+- 영구 계층(선택): FORTUNE_CACHE_DB 경로가 설정되면 SQLite 파일에 저장
+- 같은 키에 대한 동시 요청은 하나의 업스트림 호출로 합칩니다
+"""
+import os
+import asyncio
+import logging
+import sqlite3
+from collections import OrderedDict
+from datetime import date, datetime, time, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 설정
+FORTUNE_CACHE_SIZE = int(os.getenv("FORTUNE_CACHE_SIZE", "10000"))
+FORTUNE_CACHE_DB = os.getenv("FORTUNE_CACHE_DB")  # 비어 있으면 영구 계층 사용 안 함
+
+CacheKey = Tuple[str, str]  # (birthday, YYYY-MM-DD)
+
+def next_local_midnight(now: Optional[datetime] = None) -> float:
+    """다음 로컬 자정의 타임스탬프 반환"""
+    now = now or datetime.now()
+    return datetime.combine(now.date() + timedelta(days=1), time.min).timestamp()
+
+class FortuneCache:
+    """(생년월일, 날짜) 키로 운세를 보관하는 2계층 캐시"""
+
+    def __init__(self, max_entries: int = FORTUNE_CACHE_SIZE, db_path: Optional[str] = FORTUNE_CACHE_DB):
+        self.max_entries = max_entries
+        self.db_path = db_path
+        self._memory: "OrderedDict[CacheKey, Tuple[str, float]]" = OrderedDict()
+        self._inflight: Dict[CacheKey, asyncio.Future] = {}
+        if self.db_path:
+            self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.db_path, timeout=5)
+
+    def _init_db(self):
+        """영구 계층 테이블 생성"""
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS fortunes ("
+                "birthday TEXT NOT NULL, day TEXT NOT NULL, fortune TEXT NOT NULL, "
+                "expires_at REAL NOT NULL, PRIMARY KEY (birthday, day))"
+            )
+
+    def _db_get(self, key: CacheKey) -> Optional[Tuple[str, float]]:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT fortune, expires_at FROM fortunes WHERE birthday = ? AND day = ?", key
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _db_set(self, key: CacheKey, fortune: str, expires_at: float):
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO fortunes (birthday, day, fortune, expires_at) VALUES (?, ?, ?, ?)",
+                (key[0], key[1], fortune, expires_at)
+            )
+            # 만료된 운세 정리
+            conn.execute("DELETE FROM fortunes WHERE expires_at <= ?", (datetime.now().timestamp(),))
+
+    def _memory_get(self, key: CacheKey) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        fortune, expires_at = entry
+        if expires_at <= datetime.now().timestamp():
+            del self._memory[key]
+            return None
+        self._memory.move_to_end(key)
+        return fortune
+
+    def _memory_set(self, key: CacheKey, fortune: str, expires_at: float):
+        self._memory[key] = (fortune, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: CacheKey) -> Optional[str]:
+        """캐시된 운세 조회 (메모리 → 영구 계층 순)"""
+        fortune = self._memory_get(key)
+        if fortune is not None or not self.db_path:
+            return fortune
+        try:
+            entry = await asyncio.to_thread(self._db_get, key)
+        except Exception as e:
+            logger.warning(f"운세 캐시(DB) 조회 실패: {str(e)}")
+            return None
+        if entry is None or entry[1] <= datetime.now().timestamp():
+            return None
+        self._memory_set(key, *entry)
+        return entry[0]
+
+    async def set(self, key: CacheKey, fortune: str):
+        """운세 저장 (오늘 자정까지 유효)"""
+        expires_at = next_local_midnight()
+        self._memory_set(key, fortune, expires_at)
+        if self.db_path:
+            try:
+                await asyncio.to_thread(self._db_set, key, fortune, expires_at)
+            except Exception as e:
+                logger.warning(f"운세 캐시(DB) 저장 실패: {str(e)}")
+
+    async def get_or_create(self, birthday: str, today: date, factory: Callable[[], Awaitable[str]]) -> str:
+        """캐시된 운세를 반환하고, 없으면 factory로 한 번만 생성"""
+        key = (birthday, today.isoformat())
+        fortune = await self.get(key)
+        if fortune is not None:
+            return fortune
+
+        # 같은 키로 진행 중인 생성 요청이 있으면 그 결과를 기다림
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            fortune = await factory()
+            await self.set(key, fortune)
+            future.set_result(fortune)
+            return fortune
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없을 때 '예외가 조회되지 않음' 경고 방지
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            self._inflight.pop(key, None)
+
+    def stats(self) -> Dict[str, object]:
+        """캐시 상태 반환"""
+        return {
+            "memory_entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "persistent": bool(self.db_path),
+            "inflight": len(self._inflight),
+        }
+
+# 전역 인스턴스
+fortune_cache = FortuneCache()
@@ -0,0 +1,132 @@
+"""
+내용 주소 기반(content-addressed) TTS 음성 파일 저장소
+
+텍스트, 언어, 음성 파라미터의 해시를 파일명으로 사용하므로
+같은 요청은 다시 합성하지 않고 기존 파일을 재사용합니다.
+디렉토리 크기/파일 수가 한도를 넘으면 가장 오래 사용되지 않은 파일부터 삭제합니다.
+"""
+import os
+import json
+import uuid
+import asyncio
+import hashlib
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 설정
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(500 * 1024 * 1024)))  # 500MB
+TTS_CACHE_MAX_FILES = int(os.getenv("TTS_CACHE_MAX_FILES", "5000"))
+TTS_KEY_VERSION = "1"  # 합성 방식이 바뀌면 올려서 기존 캐시를 무효화
+
+class TTSStore:
+    """해시 이름의 MP3 파일을 보관하는 TTS 저장소"""
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = TTS_CACHE_MAX_BYTES,
+        max_files: int = TTS_CACHE_MAX_FILES
+    ):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_files = max_files
+        self._inflight: Dict[str, asyncio.Future] = {}
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, lang: str, slow: bool) -> str:
+        """텍스트/언어/음성 파라미터로 캐시 키(sha256) 생성"""
+        payload = json.dumps([TTS_KEY_VERSION, text, lang, slow], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def filename_for(key: str) -> str:
+        return f"{key}.mp3"
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self.directory, self.filename_for(key))
+
+    def temp_path_for(self, key: str) -> str:
+        """합성 중인 파일의 임시 경로 (완료 전에는 조회되지 않음)"""
+        return f"{self.path_for(key)}.{uuid.uuid4().hex}.tmp"
+
+    def commit(self, key: str, tmp_path: str) -> str:
+        """완성된 임시 파일을 저장소에 등록하고 파일명 반환"""
+        # 완성된 파일만 보이도록 원자적으로 이름 변경
+        os.replace(tmp_path, self.path_for(key))
+        return self.filename_for(key)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """저장된 파일명 반환 (없으면 None). 조회 시 최근 사용 시각 갱신"""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            return None
+        return self.filename_for(key)
+
+    async def get_or_synthesize(
+        self,
+        key: str,
+        synthesize: Callable[[str], Awaitable[None]]
+    ) -> Tuple[str, bool]:
+        """(파일명, 캐시 적중 여부) 반환. 없으면 synthesize(임시경로)로 한 번만 합성"""
+        filename = self.lookup(key)
+        if filename:
+            return filename, True
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            return await asyncio.shield(inflight), True
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        tmp_path = self.temp_path_for(key)
+        try:
+            await synthesize(tmp_path)
+            filename = self.commit(key, tmp_path)
+            future.set_result(filename)
+            await asyncio.to_thread(self.evict)
+            return filename, False
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            if not future.done():
+                future.cancel()
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            self._inflight.pop(key, None)
+
+    def evict(self) -> int:
+        """용량/개수 한도를 넘는 오래된 파일 삭제 (LRU). 삭제한 파일 수 반환"""
+        entries = []
+        total_bytes = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".mp3"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        removed = 0
+        while entries and (total_bytes > self.max_bytes or len(entries) > self.max_files):
+            _, size, path = entries.pop(0)
+            try:
+                os.remove(path)
+                total_bytes -= size
+                removed += 1
+            except OSError:
+                pass
+
+        if removed:
+            logger.info(f"TTS 캐시 정리: {removed}개 파일 삭제")
+        return removed
@@ -0,0 +1,330 @@
+"""
+ASR(음성 인식) 모델 레지스트리 및 추론 워커 모듈
+
+- ModelRegistry: 모델을 프로세스당 한 번만 로드해서 재사용
+- InferenceWorker: 크기가 제한된 큐로 추론 작업을 받아 이벤트 루프 밖(스레드)에서 실행
+- BatchScheduler: 짧은 시간 동안 들어온 요청을 모아 한 번의 배치 추론으로 실행
+"""
+import os
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 설정
+ASR_TASK = "automatic-speech-recognition"
+WHISPER_MODEL = os.getenv("WHISPER_MODEL", "openai/whisper-medium")
+ASR_PRELOAD = os.getenv("ASR_PRELOAD", "false").lower() == "true"  # 시작 시 미리 로드할지 여부
+ASR_MAX_QUEUE = int(os.getenv("ASR_MAX_QUEUE", "16"))  # 대기 가능한 최대 작업 수
+ASR_WORKERS = int(os.getenv("ASR_WORKERS", "1"))  # 동시에 추론할 작업 수
+ASR_MAX_BATCH = int(os.getenv("ASR_MAX_BATCH", "8"))  # 한 배치에 묶을 최대 클립 수
+ASR_BATCH_WAIT_MS = int(os.getenv("ASR_BATCH_WAIT_MS", "20"))  # 배치를 모으는 최대 대기 시간
+
+class InferenceQueueFull(Exception):
+    """추론 큐가 가득 찼을 때 발생하는 예외"""
+    pass
+
+class ModelRegistry:
+    """(task, model) 별로 파이프라인을 한 번만 로드해서 보관하는 레지스트리"""
+
+    def __init__(self):
+        self._models: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, task: str, model_name: str):
+        """로드된 파이프라인 반환 (없으면 최초 1회 로드)"""
+        key = (task, model_name)
+        model = self._models.get(key)
+        if model is not None:
+            return model
+
+        with self._lock:
+            # 다른 스레드가 먼저 로드했을 수 있으므로 다시 확인
+            model = self._models.get(key)
+            if model is None:
+                from transformers import pipeline
+
+                logger.info(f"모델 로딩 시작: {model_name}")
+                model = pipeline(task, model=model_name)
+                self._models[key] = model
+                logger.info(f"모델 로딩 완료: {model_name}")
+        return model
+
+    def is_loaded(self, task: str, model_name: str) -> bool:
+        """모델 로드 여부 확인"""
+        return (task, model_name) in self._models
+
+class InferenceWorker:
+    """제한된 큐에서 작업을 꺼내 스레드 풀에서 추론을 실행하는 워커"""
+
+    def __init__(self, max_queue: int = ASR_MAX_QUEUE, workers: int = ASR_WORKERS):
+        self.max_queue = max_queue
+        self.workers = workers
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks = []
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+
+    @property
+    def queue_depth(self) -> int:
+        """대기 중인 작업 수"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    @property
+    def in_flight(self) -> int:
+        """실행 중인 작업 수"""
+        return self._in_flight
+
+    def start(self):
+        """워커 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="asr")
+        self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """워커 태스크 종료"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._queue = None
+
+    async def submit(self, func: Callable, *args) -> Any:
+        """작업을 큐에 넣고 결과를 기다림 (큐가 가득 차면 InferenceQueueFull)"""
+        if self._queue is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((func, args, future))
+        except asyncio.QueueFull:
+            raise InferenceQueueFull(f"추론 대기열이 가득 찼습니다 (최대 {self.max_queue}개)")
+        return await future
+
+    async def _run(self):
+        """큐에서 작업을 꺼내 스레드 풀에서 실행"""
+        loop = asyncio.get_running_loop()
+        while True:
+            func, args, future = await self._queue.get()
+            self._in_flight += 1
+            try:
+                result = await loop.run_in_executor(self._executor, func, *args)
+                if not future.done():
+                    future.set_result(result)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                self._in_flight -= 1
+                self._queue.task_done()
+
+    def stats(self) -> Dict[str, Any]:
+        """워커 상태 반환"""
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": self.in_flight,
+            "max_queue": self.max_queue,
+            "workers": self.workers,
+        }
+
+class BatchScheduler:
+    """요청을 잠시 모아 배치 함수 한 번으로 처리하고, 호출자별 결과를 돌려주는 스케줄러
+
+    워커에 빈 자리가 생기면 첫 요청부터 max_wait_ms 동안(또는 max_batch개가 찰 때까지) 요청을 모아
+    batch_func(items) -> results 를 InferenceWorker에서 실행합니다.
+    추론이 진행되는 동안 들어온 요청은 다음 배치에 합쳐지므로 부하가 높을수록 배치가 커집니다.
+    배치 실행이 실패하면 item_func(item)으로 항목마다 다시 실행해서 문제가 있는 항목만 실패시킵니다.
+    """
+
+    def __init__(
+        self,
+        batch_func: Callable[[List[Any]], List[Any]],
+        worker: InferenceWorker,
+        item_func: Optional[Callable[[Any], Any]] = None,
+        max_batch: int = ASR_MAX_BATCH,
+        max_wait_ms: int = ASR_BATCH_WAIT_MS,
+        max_pending: int = ASR_MAX_QUEUE * ASR_MAX_BATCH
+    ):
+        self.batch_func = batch_func
+        self.worker = worker
+        self.item_func = item_func
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_pending = max_pending
+        self._pending: Optional[asyncio.Queue] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        self._dispatches = set()
+
+    @property
+    def pending(self) -> int:
+        """배치에 묶이기를 기다리는 요청 수"""
+        return self._pending.qsize() if self._pending is not None else 0
+
+    def start(self):
+        """배치 수집 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is not None:
+            return
+        self._pending = asyncio.Queue(maxsize=self.max_pending)
+        # 동시에 실행하는 배치 수를 워커 수로 제한
+        self._slots = asyncio.Semaphore(self.worker.workers)
+        self._task = asyncio.create_task(self._collect())
+
+    async def stop(self):
+        """배치 수집 태스크 종료 (아직 배치에 묶이지 않은 요청은 정리)"""
+        tasks = [self._task, *self._dispatches] if self._task else list(self._dispatches)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        while self._pending is not None and not self._pending.empty():
+            item, future, cleanup = self._pending.get_nowait()
+            future.cancel()
+            self._cleanup(cleanup, item)
+        self._task = None
+        self._dispatches = set()
+        self._pending = None
+        self._slots = None
+
+    async def submit(self, item: Any, cleanup: Optional[Callable[[Any], None]] = None) -> Any:
+        """항목 하나를 제출하고 해당 항목의 결과를 기다림
+
+        cleanup을 주면 스케줄러가 더 이상 항목을 쓰지 않을 때 (배치가 끝난 뒤, 또는 대기열이 가득 찬 경우 바로)
+        cleanup(item)을 호출합니다. 호출자가 요청 도중 취소되어도 실행 중인 배치가 끝날 때까지 항목을 유지합니다.
+        """
+        if self._task is None:
+            self.start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._pending.put_nowait((item, future, cleanup))
+        except asyncio.QueueFull:
+            self._cleanup(cleanup, item)
+            raise InferenceQueueFull(f"추론 대기열이 가득 찼습니다 (최대 {self.max_pending}개)")
+        return await future
+
+    async def _collect(self):
+        """워커에 빈 자리가 생기면 요청을 max_wait 또는 max_batch 기준으로 묶어 배치 실행을 예약"""
+        loop = asyncio.get_running_loop()
+        while True:
+            # 실행 중인 배치가 끝날 때까지 기다리는 동안 들어온 요청은 다음 배치에 함께 묶임
+            await self._slots.acquire()
+            try:
+                batch = [await self._pending.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._pending.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+            except BaseException:
+                self._slots.release()
+                raise
+
+            # 배치 실행은 별도 태스크로 넘기고 다음 배치를 모음 (자리는 배치가 끝나면 반환)
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future, Optional[Callable[[Any], None]]]]):
+        """배치 함수를 워커에서 실행하고 결과를 호출자별로 분배"""
+        try:
+            # 이미 취소된 요청(연결 끊김 등)은 추론하지 않음
+            active = [(item, future) for item, future, _ in batch if not future.done()]
+            if not active:
+                return
+            try:
+                results = await self.worker.submit(self.batch_func, [item for item, _ in active])
+            except Exception as e:
+                if self.item_func is None or len(active) == 1:
+                    for _, future in active:
+                        if not future.done():
+                            future.set_exception(e)
+                    return
+                # 배치 중 한 항목(손상된 파일 등) 때문에 실패했을 수 있으므로 항목별로 다시 실행
+                logger.warning(f"배치 추론 실패, 항목별로 다시 실행합니다 ({len(active)}개): {str(e)}")
+                await self._dispatch_each(active)
+                return
+            for (_, future), result in zip(active, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+            for item, _, cleanup in batch:
+                self._cleanup(cleanup, item)
+
+    async def _dispatch_each(self, active: List[Tuple[Any, asyncio.Future]]):
+        """항목마다 item_func을 실행하고 각자의 결과 또는 오류를 전달"""
+        for item, future in active:
+            if future.done():
+                continue
+            try:
+                result = await self.worker.submit(self.item_func, item)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(result)
+
+    @staticmethod
+    def _cleanup(cleanup: Optional[Callable[[Any], None]], item: Any):
+        """항목 정리 함수 실행 (실패해도 다른 항목 처리는 계속)"""
+        if cleanup is None:
+            return
+        try:
+            cleanup(item)
+        except Exception as e:
+            logger.warning(f"배치 항목 정리 실패: {str(e)}")
+
+# 전역 인스턴스
+model_registry = ModelRegistry()
+asr_worker = InferenceWorker()
+
+def get_asr_pipeline():
+    """Whisper ASR 파이프라인 반환 (프로세스당 1회 로드)"""
+    return model_registry.get(ASR_TASK, WHISPER_MODEL)
+
+def _result_text(result) -> str:
+    """파이프라인 결과에서 텍스트 추출"""
+    return result["text"] if isinstance(result, dict) else result
+
+def transcribe_file(audio_path: str) -> str:
+    """오디오 파일을 텍스트로 변환 (워커 스레드에서 실행)"""
+    return _result_text(get_asr_pipeline()(audio_path))
+
+def transcribe_batch(audio_paths: List[str]) -> List[str]:
+    """여러 오디오 파일을 한 번의 배치 추론으로 변환 (워커 스레드에서 실행)"""
+    results = get_asr_pipeline()(audio_paths, batch_size=len(audio_paths))
+    return [_result_text(result) for result in results]
+
+asr_batcher = BatchScheduler(transcribe_batch, asr_worker, item_func=transcribe_file)
+
+async def start_asr_engine():
+    """ASR 워커/배치 스케줄러 시작 및 (설정 시) 모델 미리 로드"""
+    asr_worker.start()
+    asr_batcher.start()
+    if ASR_PRELOAD:
+        await asyncio.get_running_loop().run_in_executor(None, get_asr_pipeline)
+
+async def stop_asr_engine():
+    """ASR 워커/배치 스케줄러 종료"""
+    await asr_batcher.stop()
+    await asr_worker.stop()
+
+def asr_status() -> Dict[str, Any]:
+    """ASR 엔진 상태 반환"""
+    status = asr_worker.stats()
+    status["batch_pending"] = asr_batcher.pending
+    status["max_batch"] = asr_batcher.max_batch
+    status["model"] = WHISPER_MODEL
+    status["model_loaded"] = model_registry.is_loaded(ASR_TASK, WHISPER_MODEL)
+    return status
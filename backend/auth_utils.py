@@ -1,16 +1,30 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
+import os
+import time
+import hashlib
+import secrets
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from fastapi import HTTPException, status
+from fastapi import HTTPException, status, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
-# 패스워드 해싱 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from cache import TTLCache
+from password_hasher import password_hasher
+
+# 패스워드 해싱 설정 (비동기 라우터에서는 password_hasher의 async 메서드 사용)
+pwd_context = password_hasher.context
 
 # JWT 설정
 SECRET_KEY = "your-secret-key-here-change-in-production"  # 실제 운영환경에서는 환경변수로 관리
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+REFRESH_TOKEN_EXPIRE_DAYS = int(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "14"))
+
+# 검증된 토큰 캐시 (토큰 해시 → 페이로드, 토큰의 exp까지 유효)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+verified_token_cache = TTLCache(max_entries=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+security = HTTPBearer()
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -38,12 +52,42 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def hash_refresh_token(token: str) -> str:
+    """
+    리프레시 토큰의 저장용 해시를 만듭니다. (원문은 저장하지 않음)
+    """
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+def create_refresh_token() -> Tuple[str, str]:
+    """
+    리프레시 토큰(무작위 문자열)을 생성하고 (토큰, 해시)를 반환합니다.
+    """
+    token = secrets.token_urlsafe(32)
+    return token, hash_refresh_token(token)
+
+def decode_token(token: str) -> dict:
+    """
+    JWT 토큰을 디코딩/서명 검증합니다. 한 번 검증된 토큰은 만료(exp)까지 캐시에서 바로 반환합니다.
+    검증에 실패하면 JWTError를 발생시킵니다.
+    """
+    key = hashlib.sha256(token.encode("utf-8")).digest()
+    payload = verified_token_cache.get(key)
+    if payload is not TTLCache.MISSING:
+        return payload
+
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    exp = payload.get("exp")
+    ttl = exp - time.time() if exp is not None else None
+    if ttl is None or ttl > 0:
+        verified_token_cache.set(key, payload, ttl)
+    return payload
+
 def verify_token(token: str) -> dict:
     """
     JWT 토큰을 검증하고 페이로드를 반환합니다.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         username = payload.get("sub")
         if username is None:
             raise HTTPException(
@@ -64,10 +108,29 @@ def get_user_id_from_token(token: str) -> Optional[int]:
     JWT 토큰에서 사용자 ID를 추출합니다.
     """
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         user_id = payload.get("user_id")
         if user_id is None:
             return None
         return int(user_id)
     except (JWTError, ValueError):
-        return None 
+        return None
+
+async def get_current_token_payload(credentials: HTTPAuthorizationCredentials = Depends(security)) -> dict:
+    """
+    인증 의존성: 검증된 JWT 페이로드를 반환합니다.
+    """
+    return verify_token(credentials.credentials)
+
+async def get_current_user_id(credentials: HTTPAuthorizationCredentials = Depends(security)) -> int:
+    """
+    인증 의존성: 현재 사용자 ID를 반환합니다.
+    """
+    user_id = get_user_id_from_token(credentials.credentials)
+    if user_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="유효하지 않은 토큰입니다",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user_id
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+감정 백필 스크립트
+감정 태깅 이전에 작성되어 "neutral"로 저장된 일기들의 감정과 이모지를 다시 분류해서 업데이트
+
+AI 서비스의 대량 감정 추출 엔드포인트(/diary/extract-emotion/batch)로 일기를 묶어서 보내고,
+스트리밍으로 돌아오는 결과를 받아 묶음 단위로 MongoDB에 반영합니다.
+실행할 때마다 새 작업 ID를 만들어 출력하며, 중단된 경우 그 ID를 --job-id로 넘기면 이어서 진행합니다.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime
+from dotenv import load_dotenv
+import httpx
+from pymongo import UpdateOne
+
+# 환경 변수 로드
+load_dotenv()
+
+from database import close_client
+from repositories import posts_repo, daily_summaries_repo, user_versions_repo
+from repositories.user_versions import POSTS_SCOPE
+from post.routes.posts import get_user_emoticon_category, get_emotion_emoji_url
+
+# AI 서비스 설정
+AI_SERVICE_URL = os.getenv("AI_SERVICE_URL", "http://localhost:8002")
+BACKFILL_CHUNK_SIZE = int(os.getenv("BACKFILL_CHUNK_SIZE", "200"))
+
+async def classify_chunk(http: httpx.AsyncClient, job_id: str, docs: list) -> dict:
+    """일기 묶음을 AI 서비스로 보내고 {post_id: 결과} 반환"""
+    payload = {
+        "job_id": job_id,
+        "items": [{"id": doc["post_id"], "text": doc.get("content", "")} for doc in docs],
+    }
+    results = {}
+    async with http.stream("POST", f"{AI_SERVICE_URL}/diary/extract-emotion/batch", json=payload) as response:
+        response.raise_for_status()
+        async for line in response.aiter_lines():
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("done"):
+                print(f"  묶음 완료: {record['completed']}/{record['total']}개 성공, {record['failed']}개 실패")
+            elif "error" in record:
+                print(f"  ❌ 일기 {record['id']} 분류 실패: {record['error']}")
+            else:
+                results[record["id"]] = record
+    return results
+
+async def backfill_emotions(job_id: str, relabel_all: bool, dry_run: bool):
+    """일기 감정을 다시 분류해서 감정/이모지 필드 업데이트"""
+    query = {} if relabel_all else {"$or": [{"emotion": "neutral"}, {"emotion": {"$exists": False}}]}
+    projection = {"_id": 1, "post_id": 1, "user_id": 1, "content": 1, "emotion": 1, "emoji": 1, "status": 1, "created_at": 1}
+    category_cache = {}
+    scanned = 0
+    updated_count = 0
+    last_id = None
+
+    try:
+        print("🔧 감정 백필 시작...")
+        async with httpx.AsyncClient(timeout=None) as http:
+            while True:
+                # _id 기준 키셋 페이지네이션으로 컬렉션을 한 번만 훑음
+                page_query = dict(query, _id={"$gt": last_id}) if last_id is not None else query
+                docs = await posts_repo.find_many(
+                    page_query, projection, sort=[("_id", 1)], limit=BACKFILL_CHUNK_SIZE
+                )
+                if not docs:
+                    break
+                last_id = docs[-1]["_id"]
+                scanned += len(docs)
+
+                results = await classify_chunk(http, job_id, docs)
+
+                operations = []
+                changes = []
+                for doc in docs:
+                    result = results.get(doc["post_id"])
+                    if result is None or result["emotion"] == doc.get("emotion"):
+                        continue
+                    user_id = doc["user_id"]
+                    if user_id not in category_cache:
+                        category_cache[user_id] = await get_user_emoticon_category(user_id)
+                    values = {
+                        "emotion": result["emotion"],
+                        "emoji": get_emotion_emoji_url(result["emotion"], category_cache[user_id]),
+                    }
+                    operations.append(UpdateOne({"_id": doc["_id"]}, {"$set": values}))
+                    changes.append((doc, {**doc, **values}))
+
+                if operations and not dry_run:
+                    write_result = await posts_repo.collection.bulk_write(operations, ordered=False)
+                    updated_count += write_result.modified_count
+                    # 컬렉션에 직접 쓰므로 달력 요약과 일기 버전(ETag)도 여기서 갱신
+                    for before, after in changes:
+                        await daily_summaries_repo.apply_change(before, after)
+                    for user_id in {before["user_id"] for before, _ in changes}:
+                        await user_versions_repo.bump(user_id, POSTS_SCOPE)
+                elif operations:
+                    updated_count += len(operations)
+                print(f"📦 {scanned}개 확인, 누적 {updated_count}개 업데이트{' (dry-run)' if dry_run else ''}")
+
+        print(f"\n🎉 감정 백필 완료! 총 {scanned}개 중 {updated_count}개 일기 업데이트됨")
+
+    except Exception as e:
+        print(f"❌ 감정 백필 중 오류 발생: {e}")
+        print(f"   같은 --job-id({job_id})로 다시 실행하면 이어서 진행합니다.")
+    finally:
+        close_client()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일기 감정 백필")
+    parser.add_argument("--job-id", default=None, help="이어서 진행할 AI 서비스 작업 ID (없으면 새 작업)")
+    parser.add_argument("--all", action="store_true", help="neutral이 아닌 일기까지 모두 다시 분류")
+    parser.add_argument("--dry-run", action="store_true", help="DB를 수정하지 않고 결과만 확인")
+    args = parser.parse_args()
+    # 이전 실행의 결과를 재사용하지 않도록 매번 새 작업 ID 사용 (이어서 할 때만 --job-id 지정)
+    job_id = args.job_id or f"backfill-{datetime.utcnow():%Y%m%d%H%M%S}-{uuid.uuid4().hex[:6]}"
+
+    print("🚀 감정 백필 스크립트 실행")
+    print(f"   AI 서비스: {AI_SERVICE_URL}, 묶음 크기: {BACKFILL_CHUNK_SIZE}")
+    print(f"   작업 ID: {job_id} (중단되면 --job-id {job_id} 로 이어서 실행)")
+    if not args.dry_run:
+        print("⚠️ 이 작업은 되돌릴 수 없습니다. 계속하시겠습니까? (y/N): ", end="")
+        response = input().strip().lower()
+        if response not in ['y', 'yes']:
+            print("❌ 감정 백필이 취소되었습니다.")
+            raise SystemExit(0)
+    asyncio.run(backfill_emotions(job_id, args.all, args.dry_run))
@@ -0,0 +1,70 @@
+"""
+프로세스 내 TTL 캐시 모듈
+
+자주 읽지만 드물게 바뀌는 값을 메모리에 잠시 보관합니다.
+항목별 만료 시각이 지나거나, 크기 한도를 넘으면 가장 오래 사용되지 않은 항목부터 제거합니다.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+_MISSING = object()
+
+class TTLCache:
+    """크기가 제한된 LRU + TTL 캐시 (스레드 안전)"""
+
+    MISSING = _MISSING  # get()에서 캐시에 없음을 나타내는 값 (None도 캐시할 수 있도록)
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: Hashable, default: Any = _MISSING) -> Any:
+        """캐시된 값 반환 (없거나 만료되면 default)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self._misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """값 저장 (ttl을 생략하면 기본 TTL 사용)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable):
+        """항목 하나 제거"""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """모든 항목 제거"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 상태 반환"""
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
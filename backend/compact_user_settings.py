@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+사용자 설정 압축 스크립트
+사용자 설정마다 복사되어 있던 이모티콘 URL 목록(emoticon_categories)을 지우고,
+공용 이모티콘 카탈로그와 다른 카테고리만 emoticon_overrides로 남김
+
+설정 조회 시에도 한 명씩 변환되지만, 이 스크립트로 모든 사용자를 한 번에 변환할 수 있습니다.
+이후 이모티콘 URL이 바뀌면 사용자 설정이 아니라 emoticon_catalog 문서 하나만 수정하면 됩니다.
+"""
+
+import asyncio
+from dotenv import load_dotenv
+from pymongo import UpdateOne
+
+# 환경 변수 로드
+load_dotenv()
+
+from database import user_settings, close_client
+from emoticon_catalog import emoticon_catalog
+
+BATCH_SIZE = 500
+
+async def compact_user_settings():
+    """이전 형식의 사용자 설정을 카탈로그 변경분 형식으로 변환"""
+    try:
+        await emoticon_catalog.load()
+        print(f"🔧 사용자 설정 압축 시작... (카탈로그 버전 {emoticon_catalog.version})")
+
+        cursor = user_settings.find(
+            {"emoticon_categories": {"$exists": True}},
+            {"_id": 1, "user_id": 1, "emoticon_categories": 1}
+        )
+        operations = []
+        updated_count = 0
+        override_count = 0
+
+        async for document in cursor:
+            overrides = emoticon_catalog.compact(document.get("emoticon_categories"))
+            if overrides:
+                override_count += 1
+                print(f"  사용자 {document.get('user_id')}: 변경한 카테고리 {list(overrides.keys())} 유지")
+            operations.append(UpdateOne(
+                {"_id": document["_id"]},
+                {
+                    "$set": {"emoticon_overrides": overrides, "catalog_version": emoticon_catalog.version},
+                    "$unset": {"emoticon_categories": ""}
+                }
+            ))
+            if len(operations) >= BATCH_SIZE:
+                result = await user_settings.bulk_write(operations, ordered=False)
+                updated_count += result.modified_count
+                operations = []
+
+        if operations:
+            result = await user_settings.bulk_write(operations, ordered=False)
+            updated_count += result.modified_count
+
+        print(f"\n🎉 압축 완료! 총 {updated_count}명의 사용자 설정 변환됨 (변경분 보유: {override_count}명)")
+
+    except Exception as e:
+        print(f"❌ 압축 중 오류 발생: {e}")
+    finally:
+        close_client()
+
+if __name__ == "__main__":
+    print("🚀 사용자 설정 압축 스크립트 실행")
+    print("⚠️ 이 작업은 되돌릴 수 없습니다. 계속하시겠습니까? (y/N): ", end="")
+
+    response = input().strip().lower()
+    if response in ['y', 'yes']:
+        asyncio.run(compact_user_settings())
+    else:
+        print("❌ 압축이 취소되었습니다.")
@@ -0,0 +1,48 @@
+"""
+조건부 요청(ETag / If-None-Match) 유틸리티 모듈
+
+조회 API는 사용자별 데이터 버전과 요청 쿼리로 강한 ETag를 만들고,
+클라이언트가 보낸 If-None-Match와 같으면 문서를 조회하지 않고 304로 응답합니다.
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response
+
+from repositories.user_versions import user_versions_repo
+
+# 캐시는 해도 되지만 쓰기 전에 항상 ETag로 다시 확인하도록 지정
+CACHE_CONTROL = "private, no-cache"
+
+def build_etag(scope: str, user_id: int, version: str, *parts) -> str:
+    """항목, 사용자, 버전과 응답을 구분하는 값(쿼리 등)으로 강한 ETag 생성"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:16]
+    return f'"{scope}-{user_id}-{version}-{digest}"'
+
+async def current_etag(request: Request, user_id: int, scope: str, *parts) -> str:
+    """현재 버전 기준 요청의 ETag (같은 경로라도 쿼리가 다르면 다른 ETag)"""
+    version = await user_versions_repo.version_tag(user_id, scope)
+    query = sorted(request.query_params.multi_items())
+    return build_etag(scope, user_id, version, request.url.path, query, *parts)
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더에 ETag가 포함되어 있는지 확인 (약한 비교)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+def set_etag(response: Response, etag: str) -> Response:
+    """응답에 ETag와 Cache-Control 헤더 설정"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """변경이 없으면 304 응답, 있으면 None"""
+    if etag_matches(request, etag):
+        return set_etag(Response(status_code=304), etag)
+    return None
@@ -1,12 +1,15 @@
-from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from dotenv import load_dotenv
 import os
 
 # .env 파일에서 환경변수 로드
 load_dotenv()
 
-# MongoDB 연결
-client = MongoClient(os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'))
+# MongoDB 연결 (비동기 motor 클라이언트 - 이벤트 루프를 블로킹하지 않음)
+client = AsyncIOMotorClient(
+    os.getenv('MONGODB_URI', 'mongodb://localhost:27017/'),
+    maxPoolSize=int(os.getenv('MONGODB_MAX_POOL_SIZE', '100'))
+)
 db = client['mini_project']  # 데이터베이스 이름
 
 # 컬렉션 정의
@@ -14,36 +17,12 @@ users = db['users']  # 사용자 컬렉션
 counters = db['counters']  # ID 카운터 컬렉션
 user_settings = db['user_settings']  # 사용자 설정 컬렉션
 posts = db['posts']  # 일기 컬렉션 추가
-
-def get_next_user_id():
-    """다음 사용자 ID를 생성합니다 (1, 2, 3, ...)"""
-    result = counters.find_one_and_update(
-        {"_id": "user_id"},
-        {"$inc": {"sequence_value": 1}},
-        upsert=True,
-        return_document=True
-    )
-    return result["sequence_value"]
-
-def get_next_setting_id():
-    """다음 설정 ID를 생성합니다 (1, 2, 3, ...)"""
-    result = counters.find_one_and_update(
-        {"_id": "setting_id"},
-        {"$inc": {"sequence_value": 1}},
-        upsert=True,
-        return_document=True
-    )
-    return result["sequence_value"]
-
-def get_next_post_id():
-    """다음 일기 ID를 생성합니다 (1, 2, 3, ...)"""
-    result = counters.find_one_and_update(
-        {"_id": "post_id"},
-        {"$inc": {"sequence_value": 1}},
-        upsert=True,
-        return_document=True
-    )
-    return result["sequence_value"]
-
-
-
+emoticon_catalog = db['emoticon_catalog']  # 공용 이모티콘 카탈로그 컬렉션
+refresh_tokens = db['refresh_tokens']  # 리프레시 토큰 컬렉션
+daily_summaries = db['daily_summaries']  # 사용자별 일별 일기 요약 컬렉션 (달력용)
+user_versions = db['user_versions']  # 사용자별 데이터 버전 컬렉션 (ETag용)
+image_blobs = db['image_blobs']  # 내용 해시 이미지 참조 수 컬렉션
+
+def close_client():
+    """MongoDB 연결을 종료합니다"""
+    client.close()
@@ -0,0 +1,57 @@
+"""
+감정 → 이모지 URL 조회 서비스
+
+공용 이모티콘 카탈로그로부터 (카테고리, 감정) → URL 표를 한 번만 만들어 읽기 전용으로 보관합니다.
+일기 작성/수정과 사용자 설정 라우터가 같은 표를 사용하며,
+카탈로그가 다시 로드되어 내용이 바뀌면 표 전체를 새로 만들어 교체합니다.
+"""
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple
+
+from emoticon_catalog import emoticon_catalog, EmoticonCatalog
+
+DEFAULT_CATEGORY = "shape"
+DEFAULT_EMOTION = "neutral"
+
+EmojiTable = Mapping[str, Mapping[str, str]]
+
+def build_table(categories: Dict[str, Dict[str, str]]) -> EmojiTable:
+    """카탈로그로부터 읽기 전용 (카테고리 → 감정 → URL) 표 생성"""
+    return MappingProxyType({
+        sys.intern(category): MappingProxyType({
+            sys.intern(emotion): sys.intern(url) for emotion, url in emoticons.items()
+        })
+        for category, emoticons in categories.items()
+    })
+
+class EmojiLookup:
+    """미리 만들어 둔 표로 감정 이모지 URL을 찾는 서비스"""
+
+    def __init__(self, categories: Dict[str, Dict[str, str]]):
+        self._table: EmojiTable = build_table(categories)
+        self._categories: Tuple[str, ...] = tuple(self._table)
+
+    def reload(self, catalog: EmoticonCatalog):
+        """카탈로그 내용으로 표를 다시 만듦 (기존 표는 참조 교체만 하므로 조회 중에도 안전)"""
+        table = build_table(catalog.categories)
+        self._table, self._categories = table, tuple(table)
+
+    @property
+    def categories(self) -> Tuple[str, ...]:
+        """사용 가능한 카테고리 이름"""
+        return self._categories
+
+    def has_category(self, category: str) -> bool:
+        """유효한 카테고리인지 확인"""
+        return category in self._table
+
+    def url_for(self, emotion: str, category: str) -> str:
+        """감정과 카테고리에 맞는 이모지 URL (없으면 기본 카테고리/중립 감정으로 대체)"""
+        table = self._table
+        emoticons = table.get(category) or table[DEFAULT_CATEGORY]
+        return emoticons.get(emotion) or emoticons[DEFAULT_EMOTION]
+
+# 전역 인스턴스 (카탈로그가 바뀌면 자동으로 다시 만듦)
+emoji_lookup = EmojiLookup(emoticon_catalog.categories)
+emoticon_catalog.add_listener(emoji_lookup.reload)
@@ -0,0 +1,113 @@
+"""
+MongoDB 인덱스 관리 모듈
+
+컬렉션별로 필요한 인덱스를 선언해 두고 앱 시작 시 한 번에 맞춥니다.
+- MANAGED_INDEXES: 있어야 하는 인덱스 (각 저장소의 INDEXES)
+- OBSOLETE_INDEXES: 더 이상 쓰는 쿼리가 없어 삭제할 인덱스 (이름으로 지정)
+- REQUIRED_INDEXES: 없으면 앱을 시작하지 않는 인덱스 (중복 검사를 유니크 인덱스에 맡기는 경우)
+$indexStats로 인덱스별 사용 횟수를 조회할 수 있습니다.
+"""
+import logging
+from typing import Any, Dict, List
+
+from pymongo import IndexModel
+
+from database import db
+from repositories import posts_repo, users_repo, user_settings_repo, refresh_tokens_repo, daily_summaries_repo
+
+logger = logging.getLogger(__name__)
+
+MANAGED_INDEXES: Dict[str, List[IndexModel]] = {
+    "posts": posts_repo.INDEXES,
+    "users": users_repo.INDEXES,
+    "user_settings": user_settings_repo.INDEXES,
+    "refresh_tokens": refresh_tokens_repo.INDEXES,
+    "daily_summaries": daily_summaries_repo.INDEXES,
+}
+
+OBSOLETE_INDEXES: Dict[str, List[str]] = {
+    # 모든 사용자의 일기를 대상으로 하는 쿼리는 없음 → 사용자별 복합 인덱스로 대체
+    "posts": [
+        "created_at_desc",
+        "status_asc",
+        "status_created_at_compound",
+        "user_created_at_post_id_compound",
+    ],
+}
+
+# 회원가입은 username/email 중복을 유니크 인덱스로만 확인하므로 없으면 중복 계정이 생김
+REQUIRED_INDEXES: Dict[str, List[str]] = {
+    "users": ["username_unique", "email_unique", "id_unique"],
+}
+
+class MissingIndexError(RuntimeError):
+    """필수 인덱스를 만들지 못했을 때 발생"""
+
+async def ensure_indexes() -> Dict[str, Dict[str, List[str]]]:
+    """선언된 인덱스 생성 및 폐기 대상 인덱스 삭제. 컬렉션별 {created, dropped, failed} 반환
+
+    인덱스는 하나씩 만들어서 하나가 실패해도 나머지는 만들어지게 합니다.
+    REQUIRED_INDEXES 중 없는 인덱스가 남으면 MissingIndexError를 발생시킵니다.
+    """
+    report: Dict[str, Dict[str, List[str]]] = {}
+    for name in sorted(set(MANAGED_INDEXES) | set(OBSOLETE_INDEXES)):
+        collection = db[name]
+        existing = {index["name"] async for index in collection.list_indexes()}
+        created: List[str] = []
+        dropped: List[str] = []
+        failed: List[str] = []
+
+        for index_name in OBSOLETE_INDEXES.get(name, []):
+            if index_name in existing:
+                await collection.drop_index(index_name)
+                dropped.append(index_name)
+
+        for index in MANAGED_INDEXES.get(name, []):
+            document = dict(index.document)
+            index_name = document["name"]
+            if index_name in existing:
+                continue
+            keys = list(document.pop("key").items())
+            try:
+                created.append(await collection.create_index(keys, **document))
+            except Exception as e:
+                # 기존 데이터가 유니크 조건을 어기는 경우 등은 경고만 남기고 다음 인덱스 진행
+                failed.append(index_name)
+                logger.warning(f"{name}.{index_name} 인덱스 생성 실패: {str(e)}")
+
+        report[name] = {"created": created, "dropped": dropped, "failed": failed}
+        if created or dropped:
+            logger.info(f"{name} 인덱스 정리: 생성 {created}, 삭제 {dropped}")
+
+    missing_required = [
+        f"{name}.{index_name}"
+        for name, index_names in REQUIRED_INDEXES.items()
+        for index_name in index_names
+        if index_name in report.get(name, {}).get("failed", [])
+    ]
+    if missing_required:
+        raise MissingIndexError(f"필수 인덱스를 만들지 못했습니다 (중복 데이터 확인 필요): {missing_required}")
+    return report
+
+async def index_usage() -> Dict[str, List[Dict[str, Any]]]:
+    """$indexStats로 컬렉션별 인덱스 사용 횟수 조회 (프로세스 재시작 후 누적)"""
+    usage: Dict[str, List[Dict[str, Any]]] = {}
+    for name in MANAGED_INDEXES:
+        stats = await db[name].aggregate([{"$indexStats": {}}]).to_list(length=None)
+        usage[name] = sorted(
+            (
+                {
+                    "name": stat["name"],
+                    "key": dict(stat["key"]),
+                    "ops": stat["accesses"]["ops"],
+                    "since": stat["accesses"]["since"].isoformat(),
+                    "managed": stat["name"] == "_id_" or any(
+                        index.document["name"] == stat["name"] for index in MANAGED_INDEXES[name]
+                    ),
+                }
+                for stat in stats
+            ),
+            key=lambda entry: entry["ops"],
+            reverse=True
+        )
+    return usage
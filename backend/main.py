@@ -1,15 +1,30 @@
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+from fastapi import FastAPI, File, UploadFile, HTTPException, Form, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from routes.auth import router as auth_router
 from routes.user_settings import router as user_settings_router
 from post.routes.posts import router as posts_router
 from post.database.mongodb import init_mongodb
+from database import close_client
+from emoticon_catalog import emoticon_catalog
+from password_hasher import password_hasher
+from post.utils.image_variants import image_variant_processor
+from post.utils.blob_store import IMMUTABLE_CACHE_CONTROL
+from index_manager import ensure_indexes, index_usage, MissingIndexError
+from auth_utils import get_current_user_id
+from asr_engine import (
+    asr_batcher, start_asr_engine, stop_asr_engine, asr_status, InferenceQueueFull
+)
 import os
+import tempfile
 # from routes.asr import router as asr_router  # ASR 라우터 제거
 from routes.images import router as images_router
 import logging
 
+# 로깅 설정
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title="AI Mini Implementation - 통합 API",
     description="인증 시스템과 포스트 시스템을 통합한 FastAPI 애플리케이션",
@@ -31,6 +46,16 @@ if os.path.exists("uploads"):
     app.mount("/images", StaticFiles(directory="uploads/images"), name="images")
     app.mount("/temp", StaticFiles(directory="uploads/temp"), name="temp")
 
+# 내용 해시 이미지(blobs/)는 파일 내용이 바뀌지 않으므로 정적 파일 응답에 immutable 캐시 헤더 추가
+BLOB_URL_PREFIXES = ("/images/blobs/", "/uploads/images/blobs/")
+
+@app.middleware("http")
+async def immutable_blob_cache(request: Request, call_next):
+    response = await call_next(request)
+    if response.status_code == 200 and request.url.path.startswith(BLOB_URL_PREFIXES):
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+    return response
+
 # 라우터 등록
 app.include_router(auth_router, prefix="/api/auth", tags=["auth"])
 app.include_router(user_settings_router, prefix="/api/user-settings", tags=["user-settings"])
@@ -55,6 +80,38 @@ async def startup_event():
         print("[OK] MongoDB 연결 성공")
     else:
         print("[WARNING] MongoDB 연결 실패 - 일부 기능이 제한될 수 있습니다")
+    
+    # 공용 이모티콘 카탈로그 로드 (DB에 없으면 기본 카탈로그 저장)
+    await emoticon_catalog.load()
+    print(f"[OK] 이모티콘 카탈로그 로드 (버전 {emoticon_catalog.version})")
+    
+    # 컬렉션별 인덱스 생성/정리 (index_manager에 선언된 목록 기준)
+    try:
+        report = await ensure_indexes()
+        for name, changes in report.items():
+            if changes["created"] or changes["dropped"]:
+                print(f"[OK] {name} 인덱스 생성 {changes['created']}, 삭제 {changes['dropped']}")
+        print("[OK] 인덱스 확인 완료")
+    except MissingIndexError as e:
+        # 유니크 인덱스 없이 회원가입을 받으면 중복 계정이 생기므로 시작하지 않음
+        print(f"[ERROR] {str(e)}")
+        raise
+    except Exception as e:
+        print(f"[WARNING] 인덱스 설정 중 오류 발생: {str(e)}")
+    
+    # ASR 추론 워커 시작 (ASR_PRELOAD=true이면 Whisper 모델 미리 로드)
+    await start_asr_engine()
+    print("[OK] ASR 추론 워커 시작")
+
+# 애플리케이션 종료 시 실행
+@app.on_event("shutdown")
+async def shutdown_event():
+    """애플리케이션 종료 시 정리"""
+    await stop_asr_engine()
+    password_hasher.shutdown()
+    image_variant_processor.shutdown()
+    close_client()
+    print("[OK] MongoDB 연결 종료")
 
 # 루트 경로
 @app.get("/")
@@ -72,23 +129,10 @@ async def root():
 @app.post("/api/asr/")
 async def asr_recognize(file: UploadFile = File(..., alias="audio"), language: str = Form("ko")):
     """음성-텍스트 변환"""
+    tmp_path = None
     try:
-        from transformers import pipeline
-        import tempfile
-        import os
-        import logging
-        
-        # 로깅 설정
-        logging.basicConfig(level=logging.INFO)
-        logger = logging.getLogger(__name__)
-        
         logger.info(f"ASR 요청 받음: 파일명={file.filename}, 언어={language}")
         
-        # Whisper 모델 로드 (최초 1회만)
-        logger.info("Whisper 모델 로딩 시작...")
-        asr_pipeline = pipeline("automatic-speech-recognition", model="openai/whisper-medium")
-        logger.info("Whisper 모델 로딩 완료")
-        
         # 파일 확장자 확인 (filename이 None일 수 있음)
         file_extension = ".m4a"  # 기본값
         if file.filename:
@@ -106,36 +150,51 @@ async def asr_recognize(file: UploadFile = File(..., alias="audio"), language: s
         
         logger.info(f"임시 파일 생성: {tmp_path}, 크기: {len(content)} bytes")
         
-        try:
-            # 음성 인식
-            logger.info("음성 인식 시작...")
-            result = asr_pipeline(tmp_path)
-            text = result["text"] if isinstance(result, dict) else result
-            logger.info(f"음성 인식 완료: {text}")
-            
-            # 임시 파일 삭제
-            os.unlink(tmp_path)
-            logger.info("임시 파일 삭제 완료")
-            
-            return {
-                "success": True,
-                "text": text,
-                "language": "ko",
-                "duration": 0.0,
-                "segments": [],
-                "timestamp": ""
-            }
-        except Exception as e:
-            logger.error(f"음성 인식 중 오류: {str(e)}", exc_info=True)
-            # 임시 파일 삭제
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-                logger.info("오류 발생 시 임시 파일 정리 완료")
-            raise e
+        # 음성 인식 (공유 모델 + 마이크로 배치, 이벤트 루프 밖에서 실행)
+        logger.info(f"음성 인식 시작... (배치 대기: {asr_batcher.pending})")
+        # 제출한 뒤에는 배치 스케줄러가 배치가 끝난 다음 임시 파일을 삭제 (요청이 취소되어도 배치는 파일을 계속 사용)
+        audio_path, tmp_path = tmp_path, None
+        text = await asr_batcher.submit(audio_path, cleanup=remove_temp_file)
+        logger.info(f"음성 인식 완료: {text}")
+        
+        return {
+            "success": True,
+            "text": text,
+            "language": "ko",
+            "duration": 0.0,
+            "segments": [],
+            "timestamp": ""
+        }
             
+    except InferenceQueueFull as e:
+        logger.warning(f"ASR 대기열 초과: {str(e)}")
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         logger.error(f"ASR 처리 오류: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"ASR 처리 오류: {str(e)}")
+    finally:
+        # 임시 파일 삭제 (배치에 제출하기 전에 실패한 경우)
+        if tmp_path:
+            remove_temp_file(tmp_path)
+
+def remove_temp_file(path: str):
+    """ASR 임시 파일 삭제"""
+    if os.path.exists(path):
+        os.unlink(path)
+        logger.info("임시 파일 삭제 완료")
+
+@app.get("/api/asr/status")
+async def get_asr_status():
+    """ASR 모델 로드 상태 및 추론 대기열 깊이 반환"""
+    return asr_status()
+
+@app.get("/api/db/index-stats")
+async def get_index_stats(current_user_id: int = Depends(get_current_user_id)):
+    """컬렉션별 인덱스 사용 횟수($indexStats) 반환 (로그인한 사용자만)"""
+    try:
+        return await index_usage()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"인덱스 통계 조회 중 오류가 발생했습니다: {str(e)}")
 
 @app.get("/api/asr/supported-languages")
 async def get_supported_languages():
@@ -0,0 +1,65 @@
+"""
+비동기 패스워드 해싱 서비스 모듈
+
+bcrypt는 의도적으로 느린 연산이라 이벤트 루프에서 직접 실행하면 다른 요청이 모두 멈춥니다.
+해싱/검증을 크기가 제한된 스레드 풀에서 실행하고 (bcrypt는 GIL을 놓기 때문에 병렬로 동작),
+BCRYPT_ROUNDS가 바뀌면 로그인할 때 새 비용으로 다시 해싱한 값을 돌려줍니다.
+"""
+import os
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+logger = logging.getLogger(__name__)
+
+# 설정
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))  # 해싱 비용 (2^rounds 반복)
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+class PasswordHasher:
+    """스레드 풀에서 bcrypt 해싱/검증을 실행하는 서비스"""
+
+    def __init__(self, rounds: int = BCRYPT_ROUNDS, workers: int = PASSWORD_HASH_WORKERS):
+        self.rounds = rounds
+        self.workers = workers
+        # 비용이 현재 설정과 다른 해시는 needs_update로 판단되어 로그인 시 다시 해싱됨
+        self.context = CryptContext(
+            schemes=["bcrypt"],
+            deprecated="auto",
+            bcrypt__default_rounds=rounds,
+            bcrypt__min_rounds=rounds,
+            bcrypt__max_rounds=rounds
+        )
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        return self._executor
+
+    async def _run(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+
+    async def hash(self, password: str) -> str:
+        """패스워드 해싱"""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """패스워드 검증"""
+        return await self._run(self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """패스워드 검증 후 (일치 여부, 새 해시) 반환. 비용이 바뀌지 않았으면 새 해시는 None"""
+        return await self._run(self.context.verify_and_update, password, hashed_password)
+
+    def shutdown(self):
+        """스레드 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+# 전역 인스턴스
+password_hasher = PasswordHasher()
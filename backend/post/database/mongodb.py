@@ -2,7 +2,7 @@
 MongoDB 연결 및 데이터베이스 작업 모듈
 """
 import os
-from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING
+from pymongo import MongoClient, DESCENDING
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 import uuid
@@ -35,8 +35,7 @@ def init_mongodb() -> bool:
         db = client[DATABASE_NAME]
         print(f"데이터베이스 선택: {DATABASE_NAME}")
         
-        # 인덱스 설정
-        setup_indexes()
+        # 인덱스는 앱 시작 시 index_manager.ensure_indexes()에서 설정
         
         return True
         
@@ -46,47 +45,6 @@ def init_mongodb() -> bool:
         db = None
         return False
 
-def setup_indexes():
-    """데이터베이스 인덱스 설정"""
-    if db is None:
-        print("[WARNING] 데이터베이스가 초기화되지 않았습니다")
-        return
-        
-    try:
-        posts_collection = db.posts
-        
-        # 기존 인덱스 확인
-        existing_indexes = list(posts_collection.list_indexes())
-        index_names = [index['name'] for index in existing_indexes]
-        
-        # 생성할 인덱스 목록
-        indexes_to_create = []
-        
-        # 1. 최신 글 조회용 (캐시링 요소별)
-        if "created_at_desc" not in index_names:
-            indexes_to_create.append(IndexModel([("created_at", DESCENDING)], name="created_at_desc"))
-            
-        # 2. 글 상태별 조회용
-        if "status_asc" not in index_names:
-            indexes_to_create.append(IndexModel([("status", ASCENDING)], name="status_asc"))
-            
-        # 3. 상태 + 생성일시 복합 인덱스 (게시된 글 목록 조회용)
-        if "status_created_at_compound" not in index_names:
-            indexes_to_create.append(IndexModel([
-                ("status", ASCENDING),
-                ("created_at", DESCENDING)
-            ], name="status_created_at_compound"))
-        
-        # 인덱스 생성
-        if indexes_to_create:
-            posts_collection.create_indexes(indexes_to_create)
-            print(f"[OK] 인덱스 {len(indexes_to_create)}개 생성 완료")
-        else:
-            print("[OK] 모든 필요한 인덱스가 이미 존재합니다")
-            
-    except Exception as e:
-        print(f"[WARNING] 인덱스 설정 중 오류 발생: {str(e)}")
-
 def get_database():
     """데이터베이스 객체 반환"""
     return db
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, validator
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -8,6 +8,13 @@ class PostStatus(str, Enum):
     PUBLISHED = "published"
     DELETED = "deleted"
 
+class ImageVariantInfo(BaseModel):
+    """이미지 변형본(thumbnail, medium) 정보 모델"""
+    filename: str
+    width: int
+    height: int
+    file_size: int
+
 class ImageInfo(BaseModel):
     """이미지 정보 모델"""
     filename: str
@@ -15,6 +22,9 @@ class ImageInfo(BaseModel):
     file_path: str
     file_size: int
     upload_date: datetime
+    width: Optional[int] = None
+    height: Optional[int] = None
+    variants: Dict[str, ImageVariantInfo] = {}  # 크기별 변형본 (이름 → 정보)
 
 class PostCreate(BaseModel):
     """일기 작성 시 사용하는 모델"""
@@ -71,11 +81,45 @@ class PostListResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class PostListPageResponse(BaseModel):
+    """일기 목록 페이지 응답 모델 (커서 페이지네이션)"""
+    posts: List[PostListResponse] = []
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+
+class PostSummaryResponse(BaseModel):
+    """일기 요약 목록 응답 모델 (view=summary)"""
+    id: str
+    preview: str  # 본문 앞부분
+    truncated: bool = False  # 본문이 잘렸는지 여부
+    emotion: Optional[str] = "neutral"
+    emoji: Optional[str] = "⭐"
+    created_at: datetime
+    thumbnails: List[str] = []  # 썸네일 이미지 URL 목록
+
+class PostSummaryPageResponse(BaseModel):
+    """일기 요약 목록 페이지 응답 모델 (view=summary)"""
+    posts: List[PostSummaryResponse] = []
+    next_cursor: Optional[str] = None
+
+class CalendarDayResponse(BaseModel):
+    """달력 날짜 하나의 요약 모델"""
+    date: str  # YYYY-MM-DD
+    count: int  # 공개 일기 수
+    emotion: str = "neutral"  # 가장 많이 기록된 감정
+    emoji: Optional[str] = "⭐"  # 대표 감정의 이모지 URL
+
+class CalendarMonthResponse(BaseModel):
+    """달력 한 달치 요약 응답 모델"""
+    month: str  # YYYY-MM
+    days: List[CalendarDayResponse] = []  # 일기가 있는 날짜만 포함
+
 class PostDetailResponse(BaseModel):
     """일기 상세 조회 응답 모델"""
     id: str
     content: str
     status: PostStatus
+    emotion: Optional[str] = "neutral"
+    emoji: Optional[str] = "⭐"
     created_at: datetime
     images: List[ImageInfo] = []
     
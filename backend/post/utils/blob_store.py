@@ -0,0 +1,170 @@
+"""
+내용 주소 기반 이미지 저장소 모듈
+
+일기에 붙는 이미지는 내용의 SHA-256 해시를 파일명으로 써서 images/blobs/ab/cd/<sha256>.ext 에 한 번만 저장합니다.
+같은 사진을 여러 일기에 붙이거나 다시 올려도 파일은 하나이고, image_blobs 컬렉션의 참조 수로 사용처를 셉니다.
+일기 작성/수정/삭제 시 참조 수를 조정하고, 마지막 참조가 없어지면 원본과 변형본 파일을 삭제합니다.
+파일 내용이 바뀌지 않으므로 블롭 URL은 immutable 캐시 헤더로 제공할 수 있습니다.
+"""
+import os
+import uuid
+import asyncio
+import contextlib
+import logging
+import shutil
+from collections import Counter
+from typing import Any, AsyncIterator, Dict, Iterable, List
+
+from fastapi import HTTPException
+
+from post.utils.image_utils import IMAGES_DIR, TEMP_DIR, file_sha256, get_file_size
+from post.utils.image_variants import image_variant_processor, delete_variants
+from repositories.image_blobs import image_blobs_repo
+
+logger = logging.getLogger(__name__)
+
+BLOB_PREFIX = "blobs/"
+
+# 블롭 파일 응답 캐시 헤더 (파일명이 내용 해시라서 내용이 바뀌지 않음)
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+def is_blob(filename: str) -> bool:
+    """내용 해시로 저장된 이미지인지 확인 (예전 UUID 파일명 이미지는 False)"""
+    return isinstance(filename, str) and filename.startswith(BLOB_PREFIX)
+
+def blob_filename(digest: str, extension: str) -> str:
+    """해시로 블롭 파일명 생성 (images 디렉토리 기준, 앞 4자리로 두 단계 샤딩)"""
+    return f"{BLOB_PREFIX}{digest[:2]}/{digest[2:4]}/{digest}{extension}"
+
+class BlobStore:
+    """내용 해시 이미지 파일과 참조 수 관리"""
+
+    def __init__(self, images_dir: str = IMAGES_DIR, temp_dir: str = TEMP_DIR):
+        self.images_dir = images_dir
+        self.temp_dir = temp_dir
+        # 블롭별 잠금과 잠금을 기다리거나 가진 요청 수 (저장과 삭제가 같은 블롭에서 겹치지 않도록)
+        self._locks: Dict[str, List[Any]] = {}
+
+    def _path(self, filename: str) -> str:
+        return os.path.join(self.images_dir, filename)
+
+    @contextlib.asynccontextmanager
+    async def _locked(self, filename: str) -> AsyncIterator[None]:
+        """블롭 하나에 대한 잠금 (기다리는 요청이 없어지면 잠금도 정리)"""
+        entry = self._locks.setdefault(filename, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                self._locks.pop(filename, None)
+
+    def temp_path(self, temp_filename: str) -> str:
+        """업로드된 임시 파일 경로 (파일이 없거나 다른 디렉토리를 가리키면 404)"""
+        temp_path = os.path.join(self.temp_dir, temp_filename)
+        if os.path.basename(temp_filename) != temp_filename or not os.path.isfile(temp_path):
+            raise HTTPException(status_code=404, detail="임시 파일을 찾을 수 없습니다")
+        return temp_path
+
+    def _image_info(self, filename: str, blob: Dict[str, Any]) -> Dict[str, Any]:
+        """블롭 문서를 일기 이미지 항목 필드로 변환"""
+        info = {
+            "filename": filename,
+            "file_path": self._path(filename),
+            "file_size": blob.get("file_size") or get_file_size(self._path(filename)),
+        }
+        for key in ("width", "height", "variants"):
+            if blob.get(key) is not None:
+                info[key] = blob[key]
+        return info
+
+    async def commit_temp(self, temp_filename: str) -> Dict[str, Any]:
+        """임시 파일을 블롭으로 저장하고 참조 추가. 이미지 항목 필드 반환
+
+        블롭 이름은 서버가 임시 파일 내용을 해싱해서 정하므로, 직접 올린 파일이 있어야만 블롭을 참조할 수 있습니다.
+        이미 같은 내용의 블롭이 있으면 임시 파일은 버리고 기존 블롭과 변형본을 그대로 사용합니다.
+        블롭 파일은 변형본 생성과 정보 저장이 끝난 뒤에 제자리로 옮기므로, 파일이 보이면 정보도 항상 저장되어 있습니다.
+        """
+        temp_path = self.temp_path(temp_filename)
+        digest = await asyncio.to_thread(file_sha256, temp_path)
+        filename = blob_filename(digest, os.path.splitext(temp_filename.lower())[1])
+        path = self._path(filename)
+
+        # 참조를 먼저 잡아 두어야 동시에 진행 중인 삭제(GC)가 파일을 지우지 않음
+        blob = await image_blobs_repo.acquire(filename)
+        try:
+            async with self._locked(filename):
+                if os.path.exists(path):
+                    os.remove(temp_path)
+                    # 다른 요청이 저장을 마친 블롭이므로 저장된 정보를 다시 조회
+                    blob = await image_blobs_repo.find_one({"_id": filename}) or blob
+                    logger.debug(f"중복 이미지 재사용: {temp_filename} → {filename}")
+                else:
+                    blob.update(await self._store(temp_path, filename))
+        except Exception:
+            await self.release([filename])
+            raise
+
+        return self._image_info(filename, blob)
+
+    async def _store(self, temp_path: str, filename: str) -> Dict[str, Any]:
+        """임시 파일을 처리해서 블롭 자리에 저장하고 저장한 정보 반환"""
+        path = self._path(filename)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 처리하는 동안은 블롭 옆의 고유한 이름으로 두었다가 정보를 저장한 뒤 제자리로 이동
+        staging_path = f"{path}.{uuid.uuid4().hex}.part"
+        shutil.move(temp_path, staging_path)
+        try:
+            # EXIF 제거 및 변형본 생성 (다음 중복 업로드는 다시 처리하지 않음)
+            info = await image_variant_processor.process(filename, staging_path)
+            info["file_size"] = get_file_size(staging_path)
+            await image_blobs_repo.set_info(filename, info)
+            os.replace(staging_path, path)
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+        return info
+
+    async def retain(self, filenames: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """이미 저장된 블롭에 참조 추가. {파일명: 이미지 항목 필드} 반환 (파일이 없는 블롭은 제외)"""
+        infos = {}
+        for filename, count in Counter(f for f in filenames if is_blob(f)).items():
+            # 참조를 먼저 잡고 잠금 안에서 파일을 확인해야 진행 중인 삭제와 겹치지 않음
+            blob = await image_blobs_repo.acquire(filename, count)
+            async with self._locked(filename):
+                exists = os.path.exists(self._path(filename))
+            if exists:
+                infos[filename] = self._image_info(filename, blob)
+            else:
+                await self.release([filename] * count)
+        return infos
+
+    async def release(self, filenames: Iterable[str]) -> List[str]:
+        """블롭 참조 제거. 참조가 모두 없어진 블롭은 파일까지 삭제하고 그 목록 반환"""
+        collected = []
+        for filename, count in Counter(f for f in filenames if is_blob(f)).items():
+            blob = await image_blobs_repo.release(filename, count)
+            if blob is None or blob.get("refcount", 0) > 0:
+                continue
+            # 저장/참조 추가와 같은 잠금 안에서 참조 수를 다시 확인하고 파일 삭제
+            async with self._locked(filename):
+                if await image_blobs_repo.delete_if_unused(filename):
+                    self._delete_files(filename)
+                    collected.append(filename)
+        return collected
+
+    def _delete_files(self, filename: str):
+        """블롭 원본과 변형본 파일 삭제"""
+        try:
+            path = self._path(filename)
+            if os.path.exists(path):
+                os.remove(path)
+            delete_variants(filename, self.images_dir)
+            logger.info(f"참조가 없는 이미지 삭제: {filename}")
+        except OSError as e:
+            logger.warning(f"이미지 블롭 삭제 실패 ({filename}): {str(e)}")
+
+# 전역 인스턴스
+blob_store = BlobStore()
@@ -4,6 +4,7 @@
 import os
 import uuid
 import shutil
+import hashlib
 from typing import List, Optional, Tuple
 from fastapi import UploadFile, HTTPException
 from datetime import datetime
@@ -13,6 +14,7 @@ import aiofiles
 UPLOAD_DIR = "uploads"
 IMAGES_DIR = os.path.join(UPLOAD_DIR, "images")
 TEMP_DIR = os.path.join(UPLOAD_DIR, "temp")
+BLOBS_DIR = os.path.join(IMAGES_DIR, "blobs")  # 내용 해시로 저장하는 이미지 (images 기준 blobs/ab/cd/<sha256>.ext)
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
 MAX_IMAGES_PER_POST = 3
 ALLOWED_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif', '.webp'}
@@ -41,6 +43,14 @@ def generate_unique_filename(original_filename: str) -> str:
     unique_id = str(uuid.uuid4())
     return f"{unique_id}{extension}"
 
+def file_sha256(file_path: str) -> str:
+    """파일 내용의 SHA-256 해시"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 def validate_image_file(file: UploadFile) -> None:
     """이미지 파일 유효성 검사"""
     # 파일명 확인
@@ -208,7 +218,7 @@ class ImageUtils:
         # 파일 유효성 검사
         validate_image_file(file)
         
-        # 고유한 파일명 생성
+        # 고유한 파일명 생성 (업로드마다 다른 이름, 내용 해시는 일기에 저장할 때 계산)
         if not file.filename:
             raise HTTPException(status_code=400, detail="파일명이 없습니다")
         unique_filename = generate_unique_filename(file.filename)
@@ -0,0 +1,156 @@
+"""
+이미지 크기별 변형본 생성 모듈
+
+일기에 이미지가 저장될 때 원본을 한 번만 디코딩해서
+- EXIF(촬영 위치 등)를 지우고 방향만 반영한 원본으로 다시 저장하고
+- 목록/상세 화면용 작은 이미지(thumbnail, medium)를 WebP/JPEG로 만듭니다.
+이미지 디코딩/인코딩은 CPU를 오래 쓰므로 크기가 제한된 스레드 풀에서 실행합니다 (Pillow는 GIL을 놓고 동작).
+Pillow가 설치되어 있지 않거나 변환에 실패하면 원본만 사용합니다.
+"""
+import os
+import uuid
+import asyncio
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from post.utils.image_utils import IMAGES_DIR
+
+logger = logging.getLogger(__name__)
+
+# 설정
+IMAGE_VARIANTS = {
+    "thumbnail": int(os.getenv("IMAGE_THUMBNAIL_SIZE", "320")),  # 긴 변 최대 픽셀
+    "medium": int(os.getenv("IMAGE_MEDIUM_SIZE", "1080")),
+}
+IMAGE_VARIANT_FORMAT = os.getenv("IMAGE_VARIANT_FORMAT", "webp").lower()  # webp 또는 jpeg
+IMAGE_VARIANT_QUALITY = int(os.getenv("IMAGE_VARIANT_QUALITY", "80"))
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+VARIANT_EXTENSIONS = {"webp": ".webp", "jpeg": ".jpg"}
+
+def variant_filename(filename: str, name: str) -> str:
+    """원본 파일명으로 변형본 파일명 생성 (예: abc.png → abc_thumbnail.webp)"""
+    stem = os.path.splitext(filename)[0]
+    return f"{stem}_{name}{VARIANT_EXTENSIONS.get(IMAGE_VARIANT_FORMAT, '.webp')}"
+
+def _strip_metadata(image, path: str):
+    """방향을 반영한 이미지를 메타데이터 없이 원본 경로에 다시 저장"""
+    save_options: Dict[str, Any] = {}
+    if image.format == "JPEG":
+        save_options = {"quality": 95}
+    elif image.format == "WEBP":
+        save_options = {"quality": 95}
+    _save_atomic(image, path, image.format, **save_options)
+
+def _save_atomic(image, path: str, pil_format: str, **save_options):
+    """고유한 임시 파일에 저장한 뒤 이름을 바꿔서, 동시에 같은 파일을 만들어도 깨진 파일이 보이지 않게 저장"""
+    tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+    try:
+        image.save(tmp_path, format=pil_format, **save_options)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def generate_variants(filename: str, images_dir: str = IMAGES_DIR, source_path: Optional[str] = None) -> Dict[str, Any]:
+    """원본을 한 번 디코딩해서 EXIF 제거 및 변형본 생성 (스레드 풀에서 실행)
+
+    source_path를 주면 그 파일을 처리하고 변형본 이름만 filename 기준으로 만듭니다 (아직 제자리에 옮기기 전인 파일용).
+    반환: {"width", "height", "file_size", "variants": {이름: {filename, width, height, file_size}}}
+    """
+    from PIL import Image, ImageOps
+
+    path = source_path or os.path.join(images_dir, filename)
+    with Image.open(path) as source:
+        source_format = source.format
+        animated = getattr(source, "is_animated", False)
+        has_metadata = bool(source.getexif()) or "exif" in source.info
+        # EXIF 방향 정보를 픽셀에 반영 (이후 저장본에는 EXIF가 남지 않음)
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    image.format = source_format
+
+    # 애니메이션 이미지는 원본을 그대로 두고 첫 프레임으로만 변형본 생성
+    if has_metadata and not animated and source_format in ("JPEG", "PNG", "WEBP"):
+        _strip_metadata(image, path)
+
+    has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+    if IMAGE_VARIANT_FORMAT == "jpeg":
+        if has_alpha:
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            background.paste(image.convert("RGBA"), mask=image.convert("RGBA").split()[-1])
+            base = background
+        else:
+            base = image.convert("RGB")
+        pil_format = "JPEG"
+    else:
+        base = image.convert("RGBA" if has_alpha else "RGB")
+        pil_format = "WEBP"
+
+    variants = {}
+    for name, max_size in IMAGE_VARIANTS.items():
+        variant = base.copy()
+        variant.thumbnail((max_size, max_size), Image.LANCZOS)
+        variant_name = variant_filename(filename, name)
+        variant_path = os.path.join(images_dir, variant_name)
+        _save_atomic(variant, variant_path, pil_format, quality=IMAGE_VARIANT_QUALITY, optimize=True)
+        variants[name] = {
+            "filename": variant_name,
+            "width": variant.width,
+            "height": variant.height,
+            "file_size": os.path.getsize(variant_path),
+        }
+
+    return {
+        "width": image.width,
+        "height": image.height,
+        "file_size": os.path.getsize(path),
+        "variants": variants,
+    }
+
+def delete_variants(filename: str, images_dir: str = IMAGES_DIR) -> int:
+    """원본 파일명에 해당하는 변형본 삭제. 삭제한 개수 반환"""
+    deleted = 0
+    for name in IMAGE_VARIANTS:
+        path = os.path.join(images_dir, variant_filename(filename, name))
+        try:
+            if os.path.exists(path):
+                os.remove(path)
+                deleted += 1
+        except OSError:
+            pass
+    return deleted
+
+class ImageVariantProcessor:
+    """스레드 풀에서 이미지 변형본을 생성하는 서비스"""
+
+    def __init__(self, workers: int = IMAGE_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image")
+        return self._executor
+
+    async def process(self, filename: str, source_path: Optional[str] = None) -> Dict[str, Any]:
+        """영구 저장소의 이미지를 처리하고 이미지 정보에 합칠 필드 반환 (실패하면 빈 dict)"""
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(), generate_variants, filename, IMAGES_DIR, source_path
+            )
+        except ImportError:
+            logger.warning("Pillow가 설치되어 있지 않아 이미지 변형본을 만들지 않습니다")
+        except Exception as e:
+            logger.warning(f"이미지 변형본 생성 실패 ({filename}): {str(e)}")
+        return {}
+
+    def shutdown(self):
+        """스레드 풀 종료"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+# 전역 인스턴스
+image_variant_processor = ImageVariantProcessor()
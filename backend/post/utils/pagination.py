@@ -0,0 +1,45 @@
+"""
+일기 목록 커서(keyset) 페이지네이션 유틸리티 모듈
+"""
+import os
+import base64
+from datetime import datetime
+from typing import Optional, Tuple, Dict, Any
+from fastapi import HTTPException, status
+
+# 설정
+DEFAULT_PAGE_SIZE = int(os.getenv("POSTS_PAGE_SIZE", "20"))
+MAX_PAGE_SIZE = int(os.getenv("POSTS_MAX_PAGE_SIZE", "100"))
+
+# 정렬 순서: (created_at, post_id) 내림차순
+FEED_SORT = [("created_at", -1), ("post_id", -1)]
+
+def encode_cursor(created_at: datetime, post_id: str) -> str:
+    """마지막 일기의 (created_at, post_id)를 불투명한 커서 문자열로 변환"""
+    raw = f"{created_at.isoformat()}|{post_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """커서 문자열을 (created_at, post_id)로 복원"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, post_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), post_id
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="잘못된 커서 값입니다"
+        )
+
+def apply_cursor(query: Dict[str, Any], cursor: Optional[str]) -> Dict[str, Any]:
+    """커서 이후(더 오래된) 일기만 조회하도록 쿼리 조건 추가"""
+    if not cursor:
+        return query
+
+    created_at, post_id = decode_cursor(cursor)
+    query = dict(query)
+    query["$or"] = [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "post_id": {"$lt": post_id}}
+    ]
+    return query
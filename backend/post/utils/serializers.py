@@ -0,0 +1,113 @@
+"""
+일기 목록 응답 직렬화 유틸리티 모듈
+
+DB에서 읽은 문서는 저장할 때 이미 검증된 데이터이므로,
+목록 응답은 Pydantic 모델을 항목마다 만들지 않고 필요한 필드만 dict로 옮긴 뒤 ORJSONResponse로 바로 내보냅니다.
+응답 형식은 PostListResponse / PostListPageResponse와 같습니다 (OpenAPI 문서는 response_model로 유지).
+view=summary 목록은 본문 앞부분과 이모지, 썸네일 URL만 담은 PostSummaryResponse 형식입니다.
+"""
+import os
+from typing import Any, Dict, List, Optional
+
+from fastapi.responses import ORJSONResponse
+
+# 목록 응답에 필요한 필드만 조회
+POST_LIST_PROJECTION = {
+    "_id": 0,
+    "post_id": 1,
+    "content": 1,
+    "status": 1,
+    "emotion": 1,
+    "emoji": 1,
+    "created_at": 1,
+    "images": 1,
+}
+
+# 요약 목록 미리보기 길이 (글자 수)
+POST_PREVIEW_LENGTH = int(os.getenv("POST_PREVIEW_LENGTH", "80"))
+
+# 요약 목록용 조회 필드 (본문은 DB에서 미리보기 길이 + 1자만 잘라서 가져옴)
+POST_SUMMARY_PROJECTION = {
+    "_id": 0,
+    "post_id": 1,
+    "preview": {"$substrCP": ["$content", 0, POST_PREVIEW_LENGTH + 1]},
+    "emotion": 1,
+    "emoji": 1,
+    "created_at": 1,
+    "images.filename": 1,
+    "images.variants.thumbnail.filename": 1,
+}
+
+def projection_for(view: str) -> Dict[str, Any]:
+    """목록 보기 방식(full/summary)에 맞는 조회 필드"""
+    return POST_SUMMARY_PROJECTION if view == "summary" else POST_LIST_PROJECTION
+
+def image_url(filename: str) -> str:
+    """이미지 파일명을 클라이언트가 요청할 URL로 변환"""
+    return f"/images/{filename}"
+
+def thumbnail_filename(img_data: Dict[str, Any]) -> str:
+    """썸네일 변형본 파일명 (변형본이 없는 예전 이미지는 원본)"""
+    thumbnail = img_data.get("variants", {}).get("thumbnail")
+    return thumbnail["filename"] if thumbnail and thumbnail.get("filename") else img_data["filename"]
+
+def serialize_image(img_data: Dict[str, Any]) -> Dict[str, Any]:
+    """이미지 정보 문서를 ImageInfo 형식 dict로 변환"""
+    return {
+        "filename": img_data.get("filename", ""),
+        "original_filename": img_data.get("original_filename", ""),
+        "file_path": img_data.get("file_path", ""),
+        "file_size": img_data.get("file_size", 0),
+        "upload_date": img_data.get("upload_date"),
+        "width": img_data.get("width"),
+        "height": img_data.get("height"),
+        "variants": img_data.get("variants", {}),
+    }
+
+def serialize_post_list_item(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """일기 문서를 PostListResponse 형식 dict로 변환"""
+    raw_images = doc.get("images", [])
+    # 리스트가 아니거나, 리스트 내 요소가 dict가 아니면 제외
+    images = [serialize_image(img) for img in raw_images if isinstance(img, dict)] if isinstance(raw_images, list) else []
+    return {
+        "id": doc["post_id"],
+        "content": doc["content"],
+        "status": doc["status"],
+        "emotion": doc.get("emotion", "neutral"),
+        "emoji": doc.get("emoji", "⭐"),
+        "created_at": doc["created_at"],
+        "images": images,
+    }
+
+def serialize_post_summary(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """요약 조회 문서를 PostSummaryResponse 형식 dict로 변환"""
+    preview = doc.get("preview", "")
+    raw_images = doc.get("images", [])
+    thumbnails = [
+        image_url(thumbnail_filename(img)) for img in raw_images if isinstance(img, dict) and img.get("filename")
+    ] if isinstance(raw_images, list) else []
+    return {
+        "id": doc["post_id"],
+        "preview": preview[:POST_PREVIEW_LENGTH],
+        "truncated": len(preview) > POST_PREVIEW_LENGTH,  # True면 GET /api/posts/{post_id}로 전체 본문 조회
+        "emotion": doc.get("emotion", "neutral"),
+        "emoji": doc.get("emoji", "⭐"),
+        "created_at": doc["created_at"],
+        "thumbnails": thumbnails,
+    }
+
+def _serializer_for(view: str):
+    return serialize_post_summary if view == "summary" else serialize_post_list_item
+
+def post_list_response(docs: List[Dict[str, Any]], view: str = "full") -> ORJSONResponse:
+    """일기 목록(배열) 응답"""
+    serialize = _serializer_for(view)
+    return ORJSONResponse([serialize(doc) for doc in docs])
+
+def post_page_response(docs: List[Dict[str, Any]], next_cursor: Optional[str], view: str = "full") -> ORJSONResponse:
+    """일기 목록 페이지(posts + next_cursor) 응답"""
+    serialize = _serializer_for(view)
+    return ORJSONResponse({
+        "posts": [serialize(doc) for doc in docs],
+        "next_cursor": next_cursor,
+    })
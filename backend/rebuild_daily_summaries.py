@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+일별 일기 요약 재생성 스크립트
+posts 컬렉션의 공개 일기를 사용자·날짜·감정별로 집계해 daily_summaries 컬렉션을 다시 만듦
+
+새로 작성/수정/삭제되는 일기는 API에서 요약이 갱신되므로,
+요약 컬렉션을 처음 도입할 때나 요약이 어긋났을 때 한 번 실행하면 됩니다.
+"""
+
+import asyncio
+from dotenv import load_dotenv
+from pymongo import ReplaceOne
+
+# 환경 변수 로드
+load_dotenv()
+
+from database import posts, daily_summaries, close_client
+from repositories.daily_summaries import emotion_key
+
+BATCH_SIZE = 500
+
+async def rebuild_daily_summaries():
+    """공개 일기를 집계해 일별 요약 문서를 다시 저장"""
+    try:
+        print("🔧 일별 일기 요약 재생성 시작...")
+
+        # 사용자·날짜·감정별 개수와 마지막 이모지를 한 번의 집계로 계산
+        pipeline = [
+            {"$match": {"status": "published"}},
+            {"$sort": {"created_at": 1}},
+            {"$group": {
+                "_id": {
+                    "user_id": "$user_id",
+                    "date": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at"}},
+                    "emotion": {"$ifNull": ["$emotion", "neutral"]}
+                },
+                "count": {"$sum": 1},
+                "emoji": {"$last": "$emoji"}
+            }}
+        ]
+
+        summaries = {}
+        async for group in posts.aggregate(pipeline, allowDiskUse=True):
+            key = (group["_id"]["user_id"], group["_id"]["date"])
+            summary = summaries.setdefault(key, {
+                "user_id": key[0], "date": key[1], "count": 0, "emotions": {}, "emojis": {}
+            })
+            emotion = emotion_key(group["_id"]["emotion"])
+            summary["count"] += group["count"]
+            summary["emotions"][emotion] = summary["emotions"].get(emotion, 0) + group["count"]
+            if group.get("emoji"):
+                summary["emojis"][emotion] = group["emoji"]
+
+        # 기존 요약은 지우고 새로 저장 (공개 일기가 없어진 날짜의 요약도 정리됨)
+        deleted = await daily_summaries.delete_many({})
+        print(f"  기존 요약 {deleted.deleted_count}개 삭제")
+
+        operations = []
+        saved_count = 0
+        for summary in summaries.values():
+            operations.append(ReplaceOne(
+                {"user_id": summary["user_id"], "date": summary["date"]},
+                summary,
+                upsert=True
+            ))
+            if len(operations) >= BATCH_SIZE:
+                await daily_summaries.bulk_write(operations, ordered=False)
+                saved_count += len(operations)
+                operations = []
+
+        if operations:
+            await daily_summaries.bulk_write(operations, ordered=False)
+            saved_count += len(operations)
+
+        print(f"\n🎉 재생성 완료! 총 {saved_count}개의 일별 요약 저장됨")
+
+    except Exception as e:
+        print(f"❌ 재생성 중 오류 발생: {e}")
+    finally:
+        close_client()
+
+if __name__ == "__main__":
+    print("🚀 일별 일기 요약 재생성 스크립트 실행")
+    asyncio.run(rebuild_daily_summaries())
@@ -0,0 +1,16 @@
+"""
+motor 기반 비동기 저장소 모음
+"""
+from repositories.counters import counters_repo
+from repositories.users import users_repo
+from repositories.user_settings import user_settings_repo
+from repositories.posts import posts_repo
+from repositories.emoticon_catalog import emoticon_catalog_repo
+from repositories.refresh_tokens import refresh_tokens_repo
+from repositories.daily_summaries import daily_summaries_repo
+from repositories.user_versions import user_versions_repo
+from repositories.image_blobs import image_blobs_repo
+
+__all__ = ["counters_repo", "users_repo", "user_settings_repo", "posts_repo", "emoticon_catalog_repo",
+           "refresh_tokens_repo", "daily_summaries_repo",
+           "user_versions_repo", "image_blobs_repo"]
@@ -0,0 +1,42 @@
+"""
+비동기 MongoDB 저장소 기본 클래스
+"""
+from typing import Optional, Dict, Any, List, Tuple
+from motor.motor_asyncio import AsyncIOMotorCollection
+
+class BaseRepository:
+    """컬렉션 하나를 감싸는 비동기 저장소"""
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def find_one(self, query: Dict[str, Any], projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """조건에 맞는 문서 하나 조회"""
+        return await self.collection.find_one(query, projection)
+
+    async def find_many(
+        self,
+        query: Dict[str, Any],
+        projection: Optional[Dict[str, Any]] = None,
+        sort: Optional[List[Tuple[str, int]]] = None,
+        limit: int = 0
+    ) -> List[Dict[str, Any]]:
+        """조건에 맞는 문서 목록 조회"""
+        cursor = self.collection.find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        if limit:
+            cursor = cursor.limit(limit)
+        return await cursor.to_list(length=limit or None)
+
+    async def insert_one(self, document: Dict[str, Any]):
+        """문서 추가"""
+        return await self.collection.insert_one(document)
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        """문서 하나 수정"""
+        return await self.collection.update_one(query, update, upsert=upsert)
+
+    async def delete_one(self, query: Dict[str, Any]):
+        """문서 하나 삭제"""
+        return await self.collection.delete_one(query)
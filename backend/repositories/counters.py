@@ -0,0 +1,72 @@
+"""
+ID 카운터 저장소
+"""
+import os
+import asyncio
+from typing import Dict, List
+
+from pymongo import ReturnDocument
+
+from repositories.base import BaseRepository
+from database import counters
+
+# 한 번의 $inc로 예약할 ID 개수 (1이면 매번 DB에서 하나씩 발급)
+COUNTER_BLOCK_SIZE = int(os.getenv("COUNTER_BLOCK_SIZE", "100"))
+
+class CounterRepository(BaseRepository):
+    """counters 컬렉션 기반 순차 ID 생성기
+
+    카운터 문서를 block_size만큼 한 번에 증가시켜 ID 구간을 예약하고, 프로세스 안에서 차례로 나눠줍니다.
+    예약 구간은 DB에서 원자적으로 증가시킨 값이므로 여러 프로세스가 동시에 실행되어도 겹치지 않으며,
+    프로세스가 재시작되면 남은 구간은 버려지고 새 구간부터 발급합니다 (ID 사이에 빈 번호가 생길 수 있음).
+    """
+
+    def __init__(self, collection, block_size: int = COUNTER_BLOCK_SIZE):
+        super().__init__(collection)
+        self.block_size = max(1, block_size)
+        self._blocks: Dict[str, List[int]] = {}  # 이름 → [다음 ID, 구간 끝 ID]
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    async def _reserve(self, name: str, count: int) -> int:
+        """카운터를 count만큼 증가시키고 증가된 마지막 값을 반환합니다"""
+        result = await self.collection.find_one_and_update(
+            {"_id": name},
+            {"$inc": {"sequence_value": count}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        return result["sequence_value"]
+
+    async def next_sequence(self, name: str) -> int:
+        """이름별 다음 순차 값을 생성합니다 (1, 2, 3, ...)"""
+        block = self._blocks.get(name)
+        if block and block[0] <= block[1]:
+            value = block[0]
+            block[0] += 1
+            return value
+
+        lock = self._locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            # 기다리는 동안 다른 요청이 새 구간을 예약했을 수 있으므로 다시 확인
+            block = self._blocks.get(name)
+            if not block or block[0] > block[1]:
+                end = await self._reserve(name, self.block_size)
+                block = [end - self.block_size + 1, end]
+                self._blocks[name] = block
+            value = block[0]
+            block[0] += 1
+            return value
+
+    async def next_user_id(self) -> int:
+        """다음 사용자 ID를 생성합니다"""
+        return await self.next_sequence("user_id")
+
+    async def next_setting_id(self) -> int:
+        """다음 설정 ID를 생성합니다"""
+        return await self.next_sequence("setting_id")
+
+    async def next_post_id(self) -> int:
+        """다음 일기 ID를 생성합니다"""
+        return await self.next_sequence("post_id")
+
+counters_repo = CounterRepository(counters)
@@ -0,0 +1,78 @@
+"""
+일별 일기 요약 저장소
+
+사용자·날짜(YYYY-MM-DD)마다 공개 일기 수와 감정별 개수를 미리 집계해 둡니다.
+일기 작성/수정/삭제 시 $inc로 조금씩 갱신하므로, 달력 한 달치는 요약 문서 조회 한 번으로 만들 수 있습니다.
+문서 형식: {user_id, date, count, emotions: {감정: 개수}, emojis: {감정: 마지막 이모지 URL}}
+"""
+import re
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from pymongo import IndexModel, ASCENDING
+
+from repositories.base import BaseRepository
+from database import daily_summaries
+
+# 감정 이름은 필드 경로로 쓰이므로 '.'이나 '$'가 들어간 값은 neutral로 집계
+EMOTION_KEY_PATTERN = re.compile(r"^[A-Za-z0-9_]{1,32}$")
+
+def date_key(created_at: datetime) -> str:
+    """일기 작성 시간을 요약 문서의 날짜 키로 변환"""
+    return created_at.strftime("%Y-%m-%d")
+
+def emotion_key(emotion: Optional[str]) -> str:
+    """감정 이름을 요약 문서의 필드 이름으로 변환"""
+    if emotion and EMOTION_KEY_PATTERN.match(emotion):
+        return emotion
+    return "neutral"
+
+class DailySummaryRepository(BaseRepository):
+    """daily_summaries 컬렉션 비동기 저장소"""
+
+    INDEXES = [
+        IndexModel([("user_id", ASCENDING), ("date", ASCENDING)], name="user_id_date_unique", unique=True),
+    ]
+
+    async def add_post(self, post: Dict[str, Any]):
+        """공개 일기 하나를 해당 날짜 요약에 더함"""
+        emotion = emotion_key(post.get("emotion"))
+        update: Dict[str, Any] = {"$inc": {"count": 1, f"emotions.{emotion}": 1}}
+        if post.get("emoji"):
+            update["$set"] = {f"emojis.{emotion}": post["emoji"]}
+        return await self.update_one(
+            {"user_id": post["user_id"], "date": date_key(post["created_at"])},
+            update,
+            upsert=True
+        )
+
+    async def remove_post(self, post: Dict[str, Any]):
+        """공개 일기 하나를 해당 날짜 요약에서 뺌 (남은 일기가 없으면 요약 삭제)"""
+        query = {"user_id": post["user_id"], "date": date_key(post["created_at"])}
+        emotion = emotion_key(post.get("emotion"))
+        await self.update_one(query, {"$inc": {"count": -1, f"emotions.{emotion}": -1}})
+        return await self.delete_one({**query, "count": {"$lte": 0}})
+
+    async def apply_change(self, before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]):
+        """일기 변경 전/후 문서를 비교해 요약 갱신 (공개 상태가 아닌 문서는 집계하지 않음)"""
+        def summary_fields(post):
+            if not post or post.get("status") != "published":
+                return None
+            return date_key(post["created_at"]), emotion_key(post.get("emotion")), post.get("emoji")
+
+        if summary_fields(before) == summary_fields(after):
+            return
+        if summary_fields(before):
+            await self.remove_post(before)
+        if summary_fields(after):
+            await self.add_post(after)
+
+    async def find_month(self, user_id: int, month: str) -> List[Dict[str, Any]]:
+        """월(YYYY-MM)의 날짜별 요약 목록 조회 (날짜 오름차순)"""
+        return await self.find_many(
+            {"user_id": user_id, "date": {"$gte": f"{month}-01", "$lte": f"{month}-31"}},
+            {"_id": 0, "date": 1, "count": 1, "emotions": 1, "emojis": 1},
+            sort=[("date", ASCENDING)]
+        )
+
+daily_summaries_repo = DailySummaryRepository(daily_summaries)
@@ -0,0 +1,24 @@
+"""
+이모티콘 카탈로그 저장소
+"""
+from typing import Optional, Dict, Any
+
+from repositories.base import BaseRepository
+from database import emoticon_catalog
+
+class EmoticonCatalogRepository(BaseRepository):
+    """emoticon_catalog 컬렉션 비동기 저장소"""
+
+    async def find_catalog(self, catalog_id: str) -> Optional[Dict[str, Any]]:
+        """카탈로그 문서 조회"""
+        return await self.find_one({"_id": catalog_id})
+
+    async def save_catalog(self, catalog_id: str, version: int, categories: Dict[str, Dict[str, str]], updated_at: str):
+        """카탈로그 문서 저장 (없으면 생성)"""
+        return await self.update_one(
+            {"_id": catalog_id},
+            {"$set": {"version": version, "categories": categories, "updated_at": updated_at}},
+            upsert=True
+        )
+
+emoticon_catalog_repo = EmoticonCatalogRepository(emoticon_catalog)
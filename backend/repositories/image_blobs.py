@@ -0,0 +1,44 @@
+"""
+이미지 블롭 저장소
+
+내용 해시로 저장한 이미지 파일마다 {_id: 파일명, refcount, file_size, width, height, variants} 문서를 둡니다.
+refcount는 이 이미지를 쓰는 일기 이미지 항목 수이며, 0이 되면 파일과 문서를 삭제합니다.
+"""
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from pymongo import ReturnDocument
+
+from repositories.base import BaseRepository
+from database import image_blobs
+
+class ImageBlobRepository(BaseRepository):
+    """image_blobs 컬렉션 비동기 저장소"""
+
+    async def acquire(self, blob_id: str, count: int = 1) -> Dict[str, Any]:
+        """참조 수 증가 (문서가 없으면 생성) 후 증가된 문서 반환"""
+        return await self.collection.find_one_and_update(
+            {"_id": blob_id},
+            {"$inc": {"refcount": count}, "$setOnInsert": {"created_at": datetime.utcnow()}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def release(self, blob_id: str, count: int = 1) -> Optional[Dict[str, Any]]:
+        """참조 수 감소 후 감소된 문서 반환 (문서가 없으면 None)"""
+        return await self.collection.find_one_and_update(
+            {"_id": blob_id},
+            {"$inc": {"refcount": -count}},
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def set_info(self, blob_id: str, info: Dict[str, Any]):
+        """이미지 크기/변형본 정보 저장"""
+        return await self.update_one({"_id": blob_id}, {"$set": info})
+
+    async def delete_if_unused(self, blob_id: str) -> bool:
+        """참조가 없으면 문서 삭제. 삭제했으면 True"""
+        result = await self.delete_one({"_id": blob_id, "refcount": {"$lte": 0}})
+        return result.deleted_count == 1
+
+image_blobs_repo = ImageBlobRepository(image_blobs)
@@ -0,0 +1,42 @@
+"""
+일기 저장소
+"""
+from typing import Optional, Dict, Any
+
+from pymongo import IndexModel, ASCENDING, DESCENDING
+
+from repositories.base import BaseRepository
+from database import posts
+
+class PostRepository(BaseRepository):
+    """posts 컬렉션 비동기 저장소
+
+    일기를 쓴 쪽에서 달력 요약(daily_summaries)까지 갱신한 뒤 사용자의 일기 버전(ETag)을 올려야 합니다.
+    버전을 먼저 올리면 그 사이의 조회가 예전 요약에 새 ETag를 붙여 캐시할 수 있습니다.
+    """
+
+    INDEXES = [
+        # 사용자별 목록/날짜별 조회 (user_id, status 일치 → created_at, post_id 순 정렬/범위)
+        IndexModel([
+            ("user_id", ASCENDING),
+            ("status", ASCENDING),
+            ("created_at", DESCENDING),
+            ("post_id", DESCENDING)
+        ], name="user_status_created_at_post_id"),
+        # 일기 하나 조회/수정/삭제 (post_id + user_id)
+        IndexModel([("post_id", ASCENDING), ("user_id", ASCENDING)], name="post_id_user_id"),
+    ]
+
+    async def find_for_user(self, post_id: str, user_id: int) -> Optional[Dict[str, Any]]:
+        """본인의 일기 하나 조회"""
+        return await self.find_one({"post_id": post_id, "user_id": user_id})
+
+    async def update_for_user(self, post_id: str, user_id: int, values: Dict[str, Any]):
+        """본인의 일기 필드 수정"""
+        result = await self.update_one(
+            {"post_id": post_id, "user_id": user_id},
+            {"$set": values}
+        )
+        return result
+
+posts_repo = PostRepository(posts)
@@ -0,0 +1,55 @@
+"""
+리프레시 토큰 저장소
+
+토큰 원문은 저장하지 않고 SHA-256 해시만 보관합니다.
+한 번 로그인해서 이어지는 토큰들은 같은 family_id를 가지며, 사용된 토큰은 revoked_at이 기록됩니다.
+만료된 토큰은 expires_at TTL 인덱스로 MongoDB가 자동 삭제합니다.
+"""
+from datetime import datetime
+from typing import Optional, Dict, Any
+
+from pymongo import IndexModel, ASCENDING, ReturnDocument
+
+from repositories.base import BaseRepository
+from database import refresh_tokens
+
+class RefreshTokenRepository(BaseRepository):
+    """refresh_tokens 컬렉션 비동기 저장소"""
+
+    INDEXES = [
+        IndexModel([("token_hash", ASCENDING)], name="token_hash_unique", unique=True),
+        IndexModel([("family_id", ASCENDING)], name="family_id_asc"),
+        IndexModel([("user_id", ASCENDING)], name="user_id_asc"),
+        IndexModel([("expires_at", ASCENDING)], name="expires_at_ttl", expireAfterSeconds=0),
+    ]
+
+    async def find_by_hash(self, token_hash: str) -> Optional[Dict[str, Any]]:
+        """토큰 해시로 조회"""
+        return await self.find_one({"token_hash": token_hash})
+
+    async def consume(self, token_hash: str, replaced_by: str, now: datetime) -> Optional[Dict[str, Any]]:
+        """유효한 토큰을 사용 처리하고 사용 전 문서 반환 (이미 사용/폐기/만료된 토큰이면 None)
+
+        조회와 폐기를 한 번의 원자적 연산으로 처리하므로 같은 토큰으로 동시에 요청해도 한 번만 성공합니다.
+        """
+        return await self.collection.find_one_and_update(
+            {"token_hash": token_hash, "revoked_at": None, "expires_at": {"$gt": now}},
+            {"$set": {"revoked_at": now, "replaced_by": replaced_by}},
+            return_document=ReturnDocument.BEFORE
+        )
+
+    async def revoke_family(self, family_id: str, now: datetime):
+        """같은 로그인에서 이어진 토큰 모두 폐기"""
+        return await self.collection.update_many(
+            {"family_id": family_id, "revoked_at": None},
+            {"$set": {"revoked_at": now}}
+        )
+
+    async def revoke_user(self, user_id: int, now: datetime):
+        """사용자의 모든 토큰 폐기 (패스워드 변경, 탈퇴 시)"""
+        return await self.collection.update_many(
+            {"user_id": user_id, "revoked_at": None},
+            {"$set": {"revoked_at": now}}
+        )
+
+refresh_tokens_repo = RefreshTokenRepository(refresh_tokens)
@@ -0,0 +1,74 @@
+"""
+사용자 설정 저장소
+"""
+import os
+from typing import Optional, Dict, Any
+
+from pymongo import IndexModel, ASCENDING
+
+from repositories.base import BaseRepository
+from repositories.user_versions import user_versions_repo, SETTINGS_SCOPE
+from database import user_settings
+from cache import TTLCache
+
+# 설정 캐시 (여러 프로세스로 실행될 때 다른 프로세스의 변경은 TTL 안에 반영됨)
+SETTINGS_CACHE_TTL = float(os.getenv("SETTINGS_CACHE_TTL", "300"))
+SETTINGS_CACHE_SIZE = int(os.getenv("SETTINGS_CACHE_SIZE", "10000"))
+
+class UserSettingsRepository(BaseRepository):
+    """user_settings 컬렉션 비동기 저장소
+
+    일기 작성/수정마다 필요한 선택 카테고리는 캐시해 두고,
+    이 저장소를 거치는 쓰기(insert/update/delete)가 일어나면 해당 사용자 항목을 무효화하고 설정 버전(ETag)을 올립니다.
+    """
+
+    INDEXES = [
+        IndexModel([("user_id", ASCENDING)], name="user_id_asc"),
+    ]
+
+    def __init__(self, collection):
+        super().__init__(collection)
+        self.category_cache = TTLCache(max_entries=SETTINGS_CACHE_SIZE, ttl=SETTINGS_CACHE_TTL)
+
+    async def find_by_user_id(self, user_id: int, projection: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """사용자 ID로 설정 조회"""
+        return await self.find_one({"user_id": user_id}, projection)
+
+    async def find_emotion_category(self, user_id: int) -> Optional[str]:
+        """사용자가 마지막으로 선택한 이모지 카테고리 조회 (캐시 우선, 설정이 없으면 None)"""
+        category = self.category_cache.get(user_id)
+        if category is not TTLCache.MISSING:
+            return category
+
+        # 긴 이모티콘 URL 목록은 제외하고 필요한 필드만 가져옴
+        setting = await self.find_by_user_id(user_id, {"_id": 0, "last_selected_emotion_category": 1})
+        category = setting.get("last_selected_emotion_category") if setting else None
+        self.category_cache.set(user_id, category)
+        return category
+
+    async def invalidate(self, user_id: Optional[int]):
+        """사용자 설정 캐시 무효화 및 설정 버전 증가"""
+        if user_id is not None:
+            self.category_cache.invalidate(user_id)
+            await user_versions_repo.bump(user_id, SETTINGS_SCOPE)
+
+    async def insert_one(self, document: Dict[str, Any]):
+        result = await super().insert_one(document)
+        await self.invalidate(document.get("user_id"))
+        return result
+
+    async def update_one(self, query: Dict[str, Any], update: Dict[str, Any], upsert: bool = False):
+        result = await super().update_one(query, update, upsert=upsert)
+        await self.invalidate(query.get("user_id"))
+        return result
+
+    async def delete_one(self, query: Dict[str, Any]):
+        result = await super().delete_one(query)
+        await self.invalidate(query.get("user_id"))
+        return result
+
+    async def update_by_user_id(self, user_id: int, values: Dict[str, Any], upsert: bool = False):
+        """사용자 ID로 설정 필드 수정"""
+        return await self.update_one({"user_id": user_id}, {"$set": values}, upsert=upsert)
+
+user_settings_repo = UserSettingsRepository(user_settings)
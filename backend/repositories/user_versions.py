@@ -0,0 +1,40 @@
+"""
+사용자별 데이터 버전 저장소
+
+사용자마다 {_id: user_id, epoch, posts, settings, profile} 문서 하나를 두고,
+일기/설정/프로필이 바뀔 때마다 해당 항목 번호를 $inc로 올립니다.
+조회 API는 이 번호로 ETag를 만들기 때문에, 실제 문서를 읽지 않고도 변경 여부를 알 수 있습니다.
+epoch는 문서가 처음 만들어질 때 정해지므로, 컬렉션을 비워도 예전 ETag와 겹치지 않습니다.
+"""
+import uuid
+from typing import Optional
+
+from repositories.base import BaseRepository
+from database import user_versions
+
+# 버전 항목
+POSTS_SCOPE = "posts"
+SETTINGS_SCOPE = "settings"
+PROFILE_SCOPE = "profile"
+
+class UserVersionRepository(BaseRepository):
+    """user_versions 컬렉션 비동기 저장소"""
+
+    async def version_tag(self, user_id: int, scope: str) -> str:
+        """사용자의 항목 버전을 ETag에 넣을 문자열로 반환 (변경 기록이 없으면 '0')"""
+        document = await self.find_one({"_id": user_id}, {"epoch": 1, scope: 1})
+        if not document:
+            return "0"
+        return f"{document.get('epoch', '')}.{document.get(scope, 0)}"
+
+    async def bump(self, user_id: Optional[int], scope: str):
+        """사용자의 항목 버전을 올림 (데이터를 쓴 뒤 호출)"""
+        if user_id is None:
+            return None
+        return await self.update_one(
+            {"_id": user_id},
+            {"$inc": {scope: 1}, "$setOnInsert": {"epoch": uuid.uuid4().hex[:8]}},
+            upsert=True
+        )
+
+user_versions_repo = UserVersionRepository(user_versions)
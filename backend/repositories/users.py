@@ -0,0 +1,37 @@
+"""
+사용자 저장소
+"""
+from typing import Optional, Dict, Any, List
+
+from pymongo import IndexModel, ASCENDING
+
+from repositories.base import BaseRepository
+from database import users
+
+class UserRepository(BaseRepository):
+    """users 컬렉션 비동기 저장소"""
+
+    INDEXES = [
+        IndexModel([("username", ASCENDING)], name="username_unique", unique=True),
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        # 단순 숫자 ID가 없는 예전 사용자도 있으므로 sparse
+        IndexModel([("id", ASCENDING)], name="id_unique", unique=True, sparse=True),
+    ]
+
+    async def find_by_id(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """단순 숫자 ID로 사용자 조회"""
+        return await self.find_one({"id": user_id})
+
+    async def find_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """이메일로 사용자 조회"""
+        return await self.find_one({"email": email})
+
+    async def find_by_username(self, username: str) -> Optional[Dict[str, Any]]:
+        """사용자명으로 사용자 조회"""
+        return await self.find_one({"username": username})
+
+    async def list_without_password(self) -> List[Dict[str, Any]]:
+        """패스워드를 제외한 전체 사용자 목록 조회"""
+        return await self.find_many({}, {"password": 0})
+
+users_repo = UserRepository(users)
@@ -1,32 +1,21 @@
 from fastapi import APIRouter, File, UploadFile, HTTPException, Form
-from transformers import pipeline
 import tempfile
 import os
 import logging
 
+from asr_engine import asr_batcher, asr_status, InferenceQueueFull
+
 router = APIRouter()
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Whisper 모델 로드 (최초 1회만)
-try:
-    logger.info("Whisper 모델 로딩 시작...")
-    asr_pipeline = pipeline("automatic-speech-recognition", model="openai/whisper-medium")
-    logger.info("Whisper 모델 로딩 완료")
-except Exception as e:
-    logger.error(f"Whisper 모델 로딩 실패: {e}")
-    asr_pipeline = None
-
 @router.post("/asr/")
 async def asr_recognize(file: UploadFile = File(..., alias="audio"), language: str = Form("ko")):
     try:
         logger.info(f"ASR 요청 받음: 파일명={file.filename}, 언어={language}")
         
-        if asr_pipeline is None:
-            raise HTTPException(status_code=500, detail="ASR 모델이 로드되지 않았습니다")
-        
         # 파일 확장자 확인 및 임시 파일 생성
         file_extension = ".m4a"
         if file.filename:
@@ -44,10 +33,9 @@ async def asr_recognize(file: UploadFile = File(..., alias="audio"), language: s
         
         logger.info(f"임시 파일 생성: {tmp_path}, 크기: {len(content)} bytes")
         
-        # 음성 인식
-        logger.info("음성 인식 시작...")
-        result = asr_pipeline(tmp_path)
-        text = result["text"] if isinstance(result, dict) else result
+        # 음성 인식 (공유 모델 + 마이크로 배치)
+        logger.info(f"음성 인식 시작... (배치 대기: {asr_batcher.pending})")
+        text = await asr_batcher.submit(tmp_path)
         logger.info(f"음성 인식 완료: {text}")
         
         # 임시 파일 삭제
@@ -68,8 +56,15 @@ async def asr_recognize(file: UploadFile = File(..., alias="audio"), language: s
         if 'tmp_path' in locals() and os.path.exists(tmp_path):
             os.unlink(tmp_path)
             logger.info("오류 발생 시 임시 파일 정리 완료")
+        if isinstance(e, InferenceQueueFull):
+            raise HTTPException(status_code=503, detail=str(e))
         raise HTTPException(status_code=500, detail=f"ASR 처리 오류: {str(e)}")
 
+@router.get("/asr/status")
+async def get_asr_status():
+    """ASR 모델 로드 상태 및 추론 대기열 깊이 반환"""
+    return asr_status()
+
 @router.get("/asr/supported-languages")
 async def get_supported_languages():
     """지원하는 언어 목록 반환"""
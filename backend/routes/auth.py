@@ -1,14 +1,21 @@
-from fastapi import APIRouter, HTTPException, Depends
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from pydantic import BaseModel
-from database import users, get_next_user_id
-from auth_utils import get_password_hash, verify_password, create_access_token, verify_token
-from datetime import datetime
+from repositories import users_repo, user_settings_repo, counters_repo, refresh_tokens_repo, user_versions_repo
+from repositories.user_versions import PROFILE_SCOPE
+from emoticon_catalog import emoticon_catalog
+from auth_utils import (
+    create_access_token, create_refresh_token, hash_refresh_token, get_current_token_payload,
+    REFRESH_TOKEN_EXPIRE_DAYS
+)
+from password_hasher import password_hasher
+from conditional import current_etag, not_modified, set_etag
+from datetime import datetime, timedelta
 from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
 from typing import Optional
+import uuid
 
 router = APIRouter()
-security = HTTPBearer()
 
 class UserCreate(BaseModel):
     username: str
@@ -24,6 +31,15 @@ class Token(BaseModel):
     access_token: str
     token_type: str
     user_info: dict
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class RefreshResponse(BaseModel):
+    access_token: str
+    token_type: str
+    refresh_token: str
 
 class UserUpdate(BaseModel):
     username: Optional[str] = None
@@ -38,19 +54,44 @@ class UserResponse(BaseModel):
     birthday: str
     created_at: datetime
 
+async def store_refresh_token(token_hash: str, user_id: int, family_id: str, now: datetime):
+    """리프레시 토큰 해시를 저장합니다."""
+    await refresh_tokens_repo.insert_one({
+        "token_hash": token_hash,
+        "user_id": user_id,
+        "family_id": family_id,
+        "created_at": now,
+        "expires_at": now + timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS),
+        "revoked_at": None,
+        "replaced_by": None
+    })
+
+async def ensure_user_id(user: dict) -> int:
+    """단순 숫자 ID가 없는 예전 사용자에게 ID를 부여하고 사용자의 ID 반환"""
+    if user.get("id") is not None:
+        return user["id"]
+    # 동시에 로그인해도 먼저 저장된 ID 하나만 사용
+    await users_repo.update_one(
+        {"_id": user["_id"], "id": {"$exists": False}},
+        {"$set": {"id": await counters_repo.next_user_id()}}
+    )
+    stored = await users_repo.find_one({"_id": user["_id"]})
+    user["id"] = stored["id"]
+    return user["id"]
+
+async def issue_refresh_token(user_id: int) -> str:
+    """새 로그인의 리프레시 토큰을 발급합니다."""
+    token, token_hash = create_refresh_token()
+    await store_refresh_token(token_hash, user_id, uuid.uuid4().hex, datetime.utcnow())
+    return token
+
 @router.post("/register")
 async def register(user: UserCreate):
-    # 사용자 중복 체크 (username과 email 모두 확인)
-    if users.find_one({"username": user.username}):
-        raise HTTPException(status_code=400, detail="이미 존재하는 사용자입니다")
-    if users.find_one({"email": user.email}):
-        raise HTTPException(status_code=400, detail="이미 존재하는 이메일입니다")
-    
     # 패스워드 해싱
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
     
     # 다음 단순 ID 생성
-    simple_id = get_next_user_id()
+    simple_id = await counters_repo.next_user_id()
     
     # 새로운 사용자 데이터 생성
     new_user = {
@@ -62,10 +103,16 @@ async def register(user: UserCreate):
         "created_at": datetime.utcnow()
     }
     
-    # DB에 사용자 추가
-    result = users.insert_one(new_user)
+    # DB에 사용자 추가 (username/email 중복은 유니크 인덱스로 확인)
+    try:
+        result = await users_repo.insert_one(new_user)
+    except DuplicateKeyError as e:
+        duplicated = (e.details or {}).get("keyPattern", {})
+        if "email" in duplicated:
+            raise HTTPException(status_code=400, detail="이미 존재하는 이메일입니다")
+        raise HTTPException(status_code=400, detail="이미 존재하는 사용자입니다")
     
-    # 사용자 설정 자동 생성 (Firebase URL로)
+    # 사용자 설정 자동 생성 (이모티콘은 공용 카탈로그를 사용하므로 저장하지 않음)
     from models.user_settings import UserSettings
     
     default_settings = UserSettings(
@@ -73,92 +120,43 @@ async def register(user: UserCreate):
         emoticon_enabled=True,
         voice_enabled=True,
         voice_volume=50,
-        emoticon_categories={
-            "shape": [
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fneutral_shape-removebg-preview.png?alt=media&token=02e85132-3a83-4257-8c1e-d2e478c7fcf5",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fexcited_shape-removebg-preview.png?alt=media&token=85fadfb8-7006-44d0-a39d-b3fd6070bb96",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fconfident_shape-removebg-preview.png?alt=media&token=8ab02bc8-8569-42ff-b78d-b9527f15d0af",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fangry_shape-removebg-preview.png?alt=media&token=92a25f79-4c1d-4b5d-9e5c-2f469e56cefa",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fdetermined_shape-removebg-preview.png?alt=media&token=69eb4cf0-ab61-4f5e-add3-b2148dc2a108",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fhappy_shape-removebg-preview.png?alt=media&token=5a8aa9dd-6ea5-4132-95af-385340846076",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fcalm_shape-removebg-preview.png?alt=media&token=cdc2fa85-10b7-46f6-881c-dd874c38b3ea",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Flove_shape-removebg-preview.png?alt=media&token=1a7ec74f-4297-42a4-aeb8-97aee1e9ff6c",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fsad_shape-removebg-preview.png?alt=media&token=acbc7284-1126-4428-a3b2-f8b6e7932b98",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Ftouched_shape-removebg-preview.png?alt=media&token=bbb50a1c-90d6-43fd-be40-4be4f51bc1d0",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fanxious_shape-removebg-preview.png?alt=media&token=7859ebac-cd9d-43a3-a42c-aec651d37e6e",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/shape%2Fconfused_shape-removebg-preview.png?alt=media&token=4794d127-9b61-4c68-86de-8478c4da8fb9"
-            ],
-            "fruit": [
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fneutral_fruit-removebg-preview.png?alt=media&token=9bdea06c-13e6-4c59-b961-1424422a3c39",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fhappy_fruit-removebg-preview.png?alt=media&token=d10a503b-fee7-4bc2-b141-fd4b33dae1f1",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fcalm_fruit-removebg-preview.png?alt=media&token=839efcad-0022-4cc9-ac38-90175d9026d2",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Flove_fruit-removebg-preview.png?alt=media&token=ba7857c6-5afd-48e0-addd-7b3f54583c15",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fexcited_fruit-removebg-preview.png?alt=media&token=0284bce2-aa88-4766-97fb-5d5d2248cf31",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fangry_fruit-removebg-preview.png?alt=media&token=679778b9-5a1b-469a-8e86-b01585cb1ee2",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fconfident_fruit-removebg-preview.png?alt=media&token=6edcc903-8d78-4dd9-bcdd-1c6b26645044",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fdetermined_fruit-removebg-preview.png?alt=media&token=ed288879-86c4-4d6d-946e-477f2aafc3ce",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fsad_fruit-removebg-preview.png?alt=media&token=e9e0b0f7-6590-4209-a7d1-26377eb33c05",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Ftouched_fruit-removebg-preview.png?alt=media&token=c69dee6d-7d53-4af7-a884-2f751aecbe42",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fanxious_fruit-removebg-preview.png?alt=media&token=be8f8279-2b08-47bf-9856-c39daf5eac40",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/fruit%2Fconfused_fruit-removebg-preview.png?alt=media&token=7adfcf22-af7a-4eb1-a225-34875b6540cf"
-            ],
-            "animal": [
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fneutral_animal-removebg-preview.png?alt=media&token=f884e38d-5d8c-4d4a-bb62-a47a198d384f",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fhappy_animal-removebg-preview.png?alt=media&token=66ff8e2d-d941-4fd7-9d7f-9766db03cbd5",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fcalm_animal-removebg-preview.png?alt=media&token=afd7bf65-5150-40e3-8b95-cd956dff113d",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Flove_animal-removebg-preview.png?alt=media&token=e0e2ccbd-b59a-4d09-968a-562208f90be1",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fexcited_animal-removebg-preview.png?alt=media&token=48442937-5504-4392-88a9-039aef405f14",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fangry_animal-removebg-preview.png?alt=media&token=9bde31db-8801-4af0-9368-e6ce4a35fbac",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fconfident__animal-removebg-preview.png?alt=media&token=2983b323-a2a6-40aa-9b6c-a381d944dd27",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fdetermined_animal-removebg-preview.png?alt=media&token=abf05981-4ab3-49b3-ba37-096ab8c22478",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fsad_animal-removebg-preview.png?alt=media&token=04c99bd8-8ad4-43de-91cd-3b7354780677",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Ftouched_animal-removebg-preview.png?alt=media&token=629be9ec-be17-407f-beb0-6b67f09b7036",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fanxious_animal-removebg-preview.png?alt=media&token=bd25e31d-629b-4e79-b95e-019f8c76dac2",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/animal%2Fconfused__animal-removebg-preview.png?alt=media&token=74192a1e-86a7-4eb6-b690-154984c427dc"
-            ],
-            "weather": [
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fneutral_weather-removebg-preview.png?alt=media&token=57ad1adf-baa6-4b79-96f5-066a4ec3358f",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fhappy_weather-removebg-preview.png?alt=media&token=fd77e998-6f47-459a-bd1c-458e309fed41",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fcalm_weather-removebg-preview.png?alt=media&token=7703fd25-fe2b-4750-a415-5f86c4e7b058",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Flove_weather-removebg-preview.png?alt=media&token=2451105b-ab3e-482d-bf9f-12f0a6a69a53",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fexcited_weather-removebg-preview.png?alt=media&token=5de71f38-1178-4e3c-887e-af07547caba9",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fangry_weather-removebg-preview.png?alt=media&token=2f4c6212-697d-49b7-9d5e-ae1f2b1fa84e",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fconfident_weather-removebg-preview.png?alt=media&token=ea30d002-312b-4ae5-ad85-933bbc009dc6",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fdetermined_weather-removebg-preview.png?alt=media&token=0eb8fb3d-22dd-4b4f-8e12-7d830f32be6d",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fsad_weather-removebg-preview.png?alt=media&token=aa972b9a-8952-4dc7-abe7-692ec7be0d16",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Ftouched_weather-removebg-preview.png?alt=media&token=5e224042-72ae-45a4-891a-8e6abdb5285c",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fanxious_weather-removebg-preview.png?alt=media&token=fc718a17-8d8e-4ed1-a78a-891fa9a149d0",
-                "https://firebasestorage.googleapis.com/v0/b/diary-3bbf7.firebasestorage.app/o/wheather%2Fconfused_weather-removebg-preview.png?alt=media&token=afdfb6bf-2c69-4ef2-97a1-2e5aa67e6fdb"
-            ]
-        },
         last_selected_emotion_category="shape",
         created_at=datetime.utcnow().isoformat(),
         updated_at=datetime.utcnow().isoformat()
     )
     
     # 사용자 설정을 DB에 저장
-    from database import user_settings
-    user_settings.insert_one(default_settings.dict())
+    settings_document = default_settings.dict(exclude={"emoticon_categories"})
+    settings_document["catalog_version"] = emoticon_catalog.version
+    await user_settings_repo.insert_one(settings_document)
     
     return {"message": "회원가입이 완료되었습니다", "user_id": simple_id}
 
 @router.post("/login", response_model=Token)
 async def login(user_credentials: UserLogin):
     # 사용자 조회 (email로 검색)
-    user = users.find_one({"email": user_credentials.email})
+    user = await users_repo.find_by_email(user_credentials.email)
     if not user:
         raise HTTPException(
             status_code=400, 
             detail="이메일 또는 패스워드가 잘못되었습니다"
         )
     
-    # 패스워드 검증
-    if not verify_password(user_credentials.password, user["password"]):
+    # 패스워드 검증 (스레드 풀에서 실행)
+    is_valid, new_hash = await password_hasher.verify_and_update(user_credentials.password, user["password"])
+    if not is_valid:
         raise HTTPException(
             status_code=400, 
             detail="이메일 또는 패스워드가 잘못되었습니다"
         )
     
+    # 해싱 비용(BCRYPT_ROUNDS)이 바뀐 경우 새 비용으로 다시 해싱한 값 저장
+    if new_hash:
+        await users_repo.update_one({"_id": user["_id"]}, {"$set": {"password": new_hash}})
+    
+    # 토큰에 넣을 단순 숫자 ID (없는 예전 사용자는 이번 로그인에서 부여)
+    await ensure_user_id(user)
+    
     # JWT 토큰 생성 (user_id와 email 포함)
     access_token = create_access_token(data={
         "sub": user["email"],
@@ -177,13 +175,58 @@ async def login(user_credentials: UserLogin):
     return {
         "access_token": access_token,
         "token_type": "bearer",
-        "user_info": user_info
+        "user_info": user_info,
+        "refresh_token": await issue_refresh_token(user["id"])
     }
 
+@router.post("/refresh", response_model=RefreshResponse)
+async def refresh_access_token(request: RefreshRequest):
+    """리프레시 토큰으로 새 액세스 토큰 발급 (패스워드 검증 없음)
+
+    사용한 리프레시 토큰은 폐기되고 새 리프레시 토큰이 함께 발급됩니다.
+    이미 사용된 토큰이 다시 들어오면 탈취로 보고 같은 로그인의 토큰을 모두 폐기합니다.
+    """
+    now = datetime.utcnow()
+    token_hash = hash_refresh_token(request.refresh_token)
+    new_token, new_hash = create_refresh_token()
+
+    current = await refresh_tokens_repo.consume(token_hash, new_hash, now)
+    if not current:
+        reused = await refresh_tokens_repo.find_by_hash(token_hash)
+        if reused and reused.get("revoked_at") is not None:
+            await refresh_tokens_repo.revoke_family(reused["family_id"], now)
+        raise HTTPException(status_code=401, detail="유효하지 않거나 만료된 리프레시 토큰입니다")
+
+    # 탈퇴했거나 이메일이 바뀐 경우를 반영하기 위해 사용자 확인
+    user = await users_repo.find_by_id(current["user_id"])
+    if not user:
+        await refresh_tokens_repo.revoke_family(current["family_id"], now)
+        raise HTTPException(status_code=401, detail="사용자를 찾을 수 없습니다")
+
+    await store_refresh_token(new_hash, current["user_id"], current["family_id"], now)
+
+    access_token = create_access_token(data={
+        "sub": user["email"],
+        "user_id": user["id"]
+    })
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": new_token
+    }
+
+@router.post("/logout")
+async def logout(request: RefreshRequest):
+    """리프레시 토큰 폐기 (같은 로그인에서 이어진 토큰 모두)"""
+    token = await refresh_tokens_repo.find_by_hash(hash_refresh_token(request.refresh_token))
+    if token:
+        await refresh_tokens_repo.revoke_family(token["family_id"], datetime.utcnow())
+    return {"message": "로그아웃되었습니다"}
+
 @router.get("/users")
 async def get_all_users():
     """모든 사용자 조회"""
-    all_users = list(users.find({}, {"password": 0}))  # 패스워드 제외하고 조회
+    all_users = await users_repo.list_without_password()  # 패스워드 제외하고 조회
     user_list = []
     
     for user in all_users:
@@ -205,11 +248,11 @@ async def get_user_by_id(user_id: str):
         # 단순 숫자 ID로 먼저 검색
         try:
             simple_id = int(user_id)
-            user = users.find_one({"id": simple_id})
+            user = await users_repo.find_by_id(simple_id)
         except ValueError:
             # 숫자가 아니면 ObjectId로 검색
             if ObjectId.is_valid(user_id):
-                user = users.find_one({"_id": ObjectId(user_id)})
+                user = await users_repo.find_one({"_id": ObjectId(user_id)})
             else:
                 user = None
         
@@ -231,7 +274,7 @@ async def get_user_by_id(user_id: str):
 @router.get("/users/username/{username}")
 async def get_user_by_username(username: str):
     """특정 사용자 조회 (username으로)"""
-    user = users.find_one({"username": username})
+    user = await users_repo.find_by_username(username)
     
     if not user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
@@ -253,7 +296,7 @@ async def update_user(user_id: str, user_update: UserUpdate):
             raise HTTPException(status_code=400, detail="잘못된 사용자 ID 형식입니다")
         
         # 기존 사용자 확인
-        existing_user = users.find_one({"_id": ObjectId(user_id)})
+        existing_user = await users_repo.find_one({"_id": ObjectId(user_id)})
         if not existing_user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
         
@@ -261,7 +304,7 @@ async def update_user(user_id: str, user_update: UserUpdate):
         update_data = {}
         if user_update.username is not None:
             # username 중복 체크 (다른 사용자와)
-            duplicate_user = users.find_one({
+            duplicate_user = await users_repo.find_one({
                 "username": user_update.username,
                 "_id": {"$ne": ObjectId(user_id)}
             })
@@ -285,16 +328,21 @@ async def update_user(user_id: str, user_update: UserUpdate):
         update_data["updated_at"] = datetime.utcnow()
         
         # 사용자 정보 업데이트
-        result = users.update_one(
+        result = await users_repo.update_one(
             {"_id": ObjectId(user_id)},
             {"$set": update_data}
         )
         
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="사용자 정보 수정에 실패했습니다")
+        await user_versions_repo.bump(existing_user.get("id"), PROFILE_SCOPE)
+        
+        # 패스워드가 바뀌면 기존 로그인의 리프레시 토큰은 모두 폐기 (ID가 없는 사용자는 발급된 토큰이 없음)
+        if "password" in update_data and existing_user.get("id") is not None:
+            await refresh_tokens_repo.revoke_user(existing_user["id"], datetime.utcnow())
         
         # 업데이트된 사용자 정보 반환
-        updated_user = users.find_one({"_id": ObjectId(user_id)})
+        updated_user = await users_repo.find_one({"_id": ObjectId(user_id)})
         return {
             "message": "사용자 정보가 수정되었습니다",
             "user": {
@@ -321,12 +369,14 @@ async def delete_user(user_id: str):
             raise HTTPException(status_code=400, detail="잘못된 사용자 ID 형식입니다")
         
         # 기존 사용자 확인
-        existing_user = users.find_one({"_id": ObjectId(user_id)})
+        existing_user = await users_repo.find_one({"_id": ObjectId(user_id)})
         if not existing_user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
         
         # 사용자 삭제
-        result = users.delete_one({"_id": ObjectId(user_id)})
+        result = await users_repo.delete_one({"_id": ObjectId(user_id)})
+        await refresh_tokens_repo.revoke_user(existing_user.get("id"), datetime.utcnow())
+        await user_versions_repo.bump(existing_user.get("id"), PROFILE_SCOPE)
         
         if result.deleted_count == 0:
             raise HTTPException(status_code=400, detail="사용자 삭제에 실패했습니다")
@@ -349,12 +399,14 @@ async def delete_user(user_id: str):
 async def delete_user_by_username(username: str):
     """사용자 삭제 (username으로)"""
     # 기존 사용자 확인
-    existing_user = users.find_one({"username": username})
+    existing_user = await users_repo.find_by_username(username)
     if not existing_user:
         raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
     
     # 사용자 삭제
-    result = users.delete_one({"username": username})
+    result = await users_repo.delete_one({"username": username})
+    await refresh_tokens_repo.revoke_user(existing_user.get("id"), datetime.utcnow())
+    await user_versions_repo.bump(existing_user.get("id"), PROFILE_SCOPE)
     
     if result.deleted_count == 0:
         raise HTTPException(status_code=400, detail="사용자 삭제에 실패했습니다")
@@ -369,21 +421,34 @@ async def delete_user_by_username(username: str):
     }
 
 @router.get("/user/profile")
-async def get_user_profile(credentials: HTTPAuthorizationCredentials = Depends(security)):
+async def get_user_profile(
+    request: Request,
+    response: Response,
+    payload: dict = Depends(get_current_token_payload)
+):
     """현재 로그인한 사용자의 프로필 정보 조회"""
     try:
-        # JWT 토큰 검증
-        payload = verify_token(credentials.credentials)
+        # JWT 토큰은 인증 의존성에서 검증됨
         user_email = payload.get("sub")
         
         if not user_email:
             raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다")
         
+        # 프로필이 바뀌지 않았으면 조회 없이 304 (user_id가 없는 예전 토큰은 항상 조회)
+        etag = None
+        if payload.get("user_id") is not None:
+            etag = await current_etag(request, payload["user_id"], PROFILE_SCOPE, user_email)
+            cached = not_modified(request, etag)
+            if cached:
+                return cached
+        
         # 사용자 정보 조회
-        user = users.find_one({"email": user_email})
+        user = await users_repo.find_by_email(user_email)
         if not user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
         
+        if etag:
+            set_etag(response, etag)
         return {
             "id": user.get("id", str(user["_id"])),
             "username": user["username"],
@@ -400,19 +465,18 @@ async def get_user_profile(credentials: HTTPAuthorizationCredentials = Depends(s
 @router.put("/user/profile")
 async def update_user_profile(
     user_update: UserUpdate,
-    credentials: HTTPAuthorizationCredentials = Depends(security)
+    payload: dict = Depends(get_current_token_payload)
 ):
     """현재 로그인한 사용자의 프로필 정보 수정"""
     try:
-        # JWT 토큰 검증
-        payload = verify_token(credentials.credentials)
+        # JWT 토큰은 인증 의존성에서 검증됨
         user_email = payload.get("sub")
         
         if not user_email:
             raise HTTPException(status_code=401, detail="유효하지 않은 토큰입니다")
         
         # 사용자 정보 조회
-        user = users.find_one({"email": user_email})
+        user = await users_repo.find_by_email(user_email)
         if not user:
             raise HTTPException(status_code=404, detail="사용자를 찾을 수 없습니다")
         
@@ -420,7 +484,7 @@ async def update_user_profile(
         update_data = {}
         if user_update.username is not None:
             # username 중복 체크 (다른 사용자와)
-            duplicate_user = users.find_one({
+            duplicate_user = await users_repo.find_one({
                 "username": user_update.username,
                 "email": {"$ne": user_email}
             })
@@ -430,11 +494,11 @@ async def update_user_profile(
             
         if user_update.password is not None:
             # 패스워드 해싱
-            update_data["password"] = get_password_hash(user_update.password)
+            update_data["password"] = await password_hasher.hash(user_update.password)
             
         if user_update.email is not None:
             # email 중복 체크 (다른 사용자와)
-            duplicate_user = users.find_one({
+            duplicate_user = await users_repo.find_one({
                 "email": user_update.email,
                 "email": {"$ne": user_email}
             })
@@ -452,16 +516,21 @@ async def update_user_profile(
         update_data["updated_at"] = datetime.utcnow()
         
         # 사용자 정보 업데이트
-        result = users.update_one(
+        result = await users_repo.update_one(
             {"email": user_email},
             {"$set": update_data}
         )
         
         if result.modified_count == 0:
             raise HTTPException(status_code=400, detail="사용자 정보 수정에 실패했습니다")
+        await user_versions_repo.bump(user.get("id"), PROFILE_SCOPE)
+        
+        # 패스워드가 바뀌면 기존 로그인의 리프레시 토큰은 모두 폐기 (ID가 없는 사용자는 발급된 토큰이 없음)
+        if "password" in update_data and user.get("id") is not None:
+            await refresh_tokens_repo.revoke_user(user["id"], datetime.utcnow())
         
         # 업데이트된 사용자 정보 반환
-        updated_user = users.find_one({"email": user_email})
+        updated_user = await users_repo.find_by_email(user_email)
         return {
             "message": "프로필 정보가 수정되었습니다",
             "user": {
@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import FileResponse
 import os
 
+from post.utils.blob_store import is_blob, IMMUTABLE_CACHE_CONTROL
+
 router = APIRouter(tags=["images"])
 
 @router.get("/{filename:path}")
@@ -29,7 +31,9 @@ async def get_image(filename: str):
         print(f"영구 파일 존재: {os.path.exists(permanent_path)}")
         
         if os.path.exists(permanent_path):
-            return FileResponse(permanent_path)
+            # 내용 해시 이미지는 내용이 바뀌지 않으므로 오래 캐시
+            headers = {"Cache-Control": IMMUTABLE_CACHE_CONTROL} if is_blob(filename) else None
+            return FileResponse(permanent_path, headers=headers)
         
         # 파일이 없으면 404
         raise HTTPException(
@@ -23,32 +23,43 @@ class DiaryService {
         throw Exception('토큰이 없습니다');
       }
 
-      final response = await http.get(
-        Uri.parse('$baseUrl/api/posts/'),
-        headers: {
-          'Content-Type': 'application/json',
-          'Authorization': 'Bearer $token',
-        },
-      );
+      // 커서 페이지네이션: next_cursor가 없을 때까지 페이지 단위로 조회
+      final List<dynamic> data = [];
+      String? cursor;
+      do {
+        final uri = Uri.parse('$baseUrl/api/posts/').replace(
+          queryParameters: cursor != null ? {'cursor': cursor} : null,
+        );
+        final response = await http.get(
+          uri,
+          headers: {
+            'Content-Type': 'application/json',
+            'Authorization': 'Bearer $token',
+          },
+        );
 
-      print('API 응답 상태 코드: ${response.statusCode}');
-      print('API 응답 내용: ${response.body}');
+        print('API 응답 상태 코드: ${response.statusCode}');
+        print('API 응답 내용: ${response.body}');
 
-      if (response.statusCode == 200) {
-        final List<dynamic> data = jsonDecode(response.body);
-        return data.map((item) => {
-          'date': item['created_at']?.toString().split('T')[0] ?? '',
-          'emotion': item['emotion'] ?? 'shape',
-          'emoji': item['emoji'] ?? '⭐',
-          'entry': item['content'] ?? '',
-          'images': item['images'],
-        }).toList();
-      } else if (response.statusCode == 401) {
-        throw Exception('인증에 실패했습니다');
-      } else {
-        print('일기 목록 조회 실패: ${response.body}');
-        return [];
-      }
+        if (response.statusCode == 200) {
+          final Map<String, dynamic> page = jsonDecode(response.body);
+          data.addAll(page['posts'] as List<dynamic>);
+          cursor = page['next_cursor'] as String?;
+        } else if (response.statusCode == 401) {
+          throw Exception('인증에 실패했습니다');
+        } else {
+          print('일기 목록 조회 실패: ${response.body}');
+          return [];
+        }
+      } while (cursor != null);
+
+      return data.map((item) => {
+        'date': item['created_at']?.toString().split('T')[0] ?? '',
+        'emotion': item['emotion'] ?? 'shape',
+        'emoji': item['emoji'] ?? '⭐',
+        'entry': item['content'] ?? '',
+        'images': item['images'],
+      }).toList();
     } catch (e) {
       print('API 호출 중 에러 발생: $e');
       return [];
@@ -1,4 +1,3 @@
-import 'dart:convert';
 import 'package:http/http.dart' as http;
 import 'package:provider/provider.dart';
 import '../models/app_state.dart';
@@ -16,26 +15,9 @@ class TTSService {
       }
 
       print('TTS 요청: $text (볼륨: ${appState.voiceVolume}%)');
-      
-      final response = await http.get(
-        Uri.parse('$baseUrl/tts?text=${Uri.encodeComponent(text)}&volume=${appState.voiceVolume}'),
-        headers: {
-          'Content-Type': 'application/json',
-        },
-      );
 
-      print('TTS 응답 상태: ${response.statusCode}');
-      print('TTS 응답 내용: ${response.body}');
-
-      if (response.statusCode == 200) {
-        final data = json.decode(response.body);
-        final audioUrl = data['audio_url'];
-        return '$baseUrl$audioUrl';
-      } else {
-        print('TTS 변환 실패: ${response.statusCode}');
-        print('응답 내용: ${response.body}');
-        return null;
-      }
+      // 스트리밍 엔드포인트: 별도 변환 요청 없이 재생기가 바로 받아서 재생
+      return '$baseUrl/tts/stream?text=${Uri.encodeComponent(text)}&volume=${appState.voiceVolume}';
     } catch (e) {
       print('TTS 변환 중 오류 발생: $e');
       return null;